@@ -0,0 +1,169 @@
+"""
+Replay text-recognition backends over a labeled OCR corpus (see ocr_corpus.py).
+
+Every backend reads each crop and the harness reports, per backend, button
+precision/recall (a crop counts as a button when its text scores as
+"Accept"), exact-text accuracy, p50/p99 latency and throughput. Crops are
+read once up front and visited in manifest order, so runs are reproducible
+offline.
+
+Usage: python benchmark_ocr.py corpus/manifest.json [--backend tesseract-psm8 ...] [--repeats 3]
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import platform
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+import cv2
+import numpy as np
+import pytesseract
+
+from ocr_corpus import accept_match_score, load_corpus
+from ocr_optimizer import BUTTON_SCORE, DEFAULT_OCR_PROFILE, load_ocr_profile, preprocess, tesseract_config
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clickbot", "images", "target.png")
+
+class TesseractBackend:
+    """pytesseract with an OCR profile's preprocessing and modes."""
+
+    def __init__(self, profile: Dict):
+        self.profile = profile
+
+    def recognize(self, image: np.ndarray) -> str:
+        return pytesseract.image_to_string(preprocess(image, self.profile), config=tesseract_config(self.profile)).strip()
+
+class GlyphTemplateBackend:
+    """Template-match the rendered Accept label instead of reading text.
+
+    Returns "Accept" when the label matches at any of `scales`, else "".
+    """
+
+    def __init__(self, template_path: str = TEMPLATE_PATH, threshold: float = 0.7,
+                 scales=(0.5, 0.75, 1.0, 1.5, 2.0)):
+        template = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
+        if template is None:
+            raise FileNotFoundError(f"Could not read glyph template {template_path}")
+        self.templates = [cv2.resize(template, None, fx=s, fy=s, interpolation=cv2.INTER_AREA) for s in scales]
+        self.threshold = threshold
+
+    def recognize(self, image: np.ndarray) -> str:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        for template in self.templates:
+            if template.shape[0] > gray.shape[0] or template.shape[1] > gray.shape[1]:
+                continue
+            if cv2.matchTemplate(gray, template, cv2.TM_CCOEFF_NORMED).max() >= self.threshold:
+                return "Accept"
+        return ""
+
+class CachedBackend:
+    """Memoize another backend's text by crop content hash."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.cache: Dict[str, str] = {}
+
+    def recognize(self, image: np.ndarray) -> str:
+        key = hashlib.sha1(np.ascontiguousarray(image).tobytes()).hexdigest()
+        if key not in self.cache:
+            self.cache[key] = self.backend.recognize(image)
+        return self.cache[key]
+
+# name -> factory; factories run lazily so unused backends need no setup
+BACKENDS: Dict[str, Callable[[], object]] = {
+    "tesseract-default": lambda: TesseractBackend(DEFAULT_OCR_PROFILE),
+    "tesseract-profile": lambda: TesseractBackend(load_ocr_profile()),
+    "tesseract-psm7": lambda: TesseractBackend(dict(DEFAULT_OCR_PROFILE, psm=7)),
+    "tesseract-profile-cached": lambda: CachedBackend(TesseractBackend(load_ocr_profile())),
+    "glyph-template": lambda: GlyphTemplateBackend(),
+    "glyph-template-cached": lambda: CachedBackend(GlyphTemplateBackend()),
+}
+
+def run_backend(name: str, crops, images: List[np.ndarray], repeats: int) -> Dict:
+    if not crops or repeats < 1:
+        raise ValueError(f"Nothing to benchmark: {len(crops)} crops, {repeats} repeats")
+    backend = BACKENDS[name]()
+    latencies = []
+    cases = []
+    start_all = time.perf_counter()
+    for repeat in range(repeats):
+        for crop, image in zip(crops, images):
+            start = time.perf_counter()
+            text = backend.recognize(image)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if repeat == 0:
+                cases.append({
+                    "image": os.path.basename(crop.path),
+                    "expected": crop.text,
+                    "text": text,
+                    "button": crop.button,
+                    "predicted_button": accept_match_score(text) >= BUTTON_SCORE,
+                })
+    elapsed = time.perf_counter() - start_all
+
+    true_pos = sum(c["button"] and c["predicted_button"] for c in cases)
+    false_pos = sum(not c["button"] and c["predicted_button"] for c in cases)
+    false_neg = sum(c["button"] and not c["predicted_button"] for c in cases)
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return {
+        "backend": name,
+        "precision": true_pos / (true_pos + false_pos) if true_pos + false_pos else 0.0,
+        "recall": true_pos / (true_pos + false_neg) if true_pos + false_neg else 0.0,
+        "text_accuracy": sum(c["text"].lower() == c["expected"].lower() for c in cases) / len(cases),
+        "latency_ms": {"p50": float(p50), "p99": float(p99), "mean": float(np.mean(latencies))},
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "cases": cases,
+    }
+
+def run_harness(manifest_path: str, backend_names=None, repeats: int = 3) -> Dict:
+    crops = load_corpus(manifest_path)
+    images = [crop.load() for crop in crops]
+    results = []
+    names = backend_names or list(BACKENDS)
+    if not crops:
+        logging.error(f"Corpus {manifest_path} has no crops; nothing to benchmark")
+        names = []
+    for name in names:
+        result = run_backend(name, crops, images, repeats)
+        logging.info(f"{name:26s} precision {result['precision']:6.1%}  recall {result['recall']:6.1%}  "
+                     f"text {result['text_accuracy']:6.1%}  p50 {result['latency_ms']['p50']:8.1f}ms  "
+                     f"p99 {result['latency_ms']['p99']:8.1f}ms  {result['throughput']:7.1f} crops/s")
+        results.append(result)
+
+    try:
+        tesseract_version = str(pytesseract.get_tesseract_version())
+    except Exception:
+        tesseract_version = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "corpus": os.path.abspath(manifest_path),
+        "crops": len(crops),
+        "repeats": repeats,
+        "platform": platform.platform(),
+        "opencv": cv2.__version__,
+        "tesseract": tesseract_version,
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR backends on a labeled corpus")
+    parser.add_argument("manifest", help="Corpus manifest JSON")
+    parser.add_argument("--backend", action="append", choices=sorted(BACKENDS),
+                        help="Backend to run (repeatable, default: all)")
+    parser.add_argument("--repeats", type=int, default=3, help="Passes over the corpus per backend")
+    parser.add_argument("--output", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    report = run_harness(args.manifest, args.backend, args.repeats)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+        logging.info(f"Saved OCR benchmark: {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Compare find_window_bounds strategies side by side on saved full-monitor captures.
+
+By default runs over the clickbot/images field captures, whose window bounds
+are recorded in ground_truth.json as [x, y, width, height]. Other captures
+(e.g. a debug_full.png saved by test_window_bounds.py) can be passed instead;
+without ground truth only their bounds and latency are reported.
+
+Usage: python benchmark_window_bounds.py [debug_full.png ...] [--repeats 3] [--output results.json]
+"""
+import argparse
+import json
+import logging
+import os
+import time
+
+import cv2
+import numpy as np
+
+from fast_window_finder import find_window_bounds
+from frame_context import FrameContext
+
+IMAGE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clickbot", "images")
+GROUND_TRUTH_PATH = os.path.join(IMAGE_DIR, "ground_truth.json")
+
+# name -> (strategy, options)
+CONFIGS = {
+    "edges": ("edges", {}),
+    "projection-1/2": ("projection", {"level": 1}),
+    "projection-1/4": ("projection", {"level": 2}),
+    "projection-1/4-coarse": ("projection", {"level": 2, "refine": False}),
+}
+
+def load_captures(paths, ground_truth_path):
+    """Map capture path -> expected [x, y, width, height] or None."""
+    captures = {}
+    if not paths:
+        with open(ground_truth_path, 'r') as f:
+            ground_truth = json.load(f)
+        for field, expected in ground_truth["fields"].items():
+            captures[os.path.join(IMAGE_DIR, field)] = expected.get("window")
+    for path in paths:
+        captures[path] = None
+    return captures
+
+def bounds_error(bounds, expected):
+    """Largest absolute difference between matching edges, in pixels."""
+    if bounds is None:
+        return None
+    x, y, w, h = expected
+    found = (bounds['x'], bounds['y'], bounds['x'] + bounds['width'], bounds['y'] + bounds['height'])
+    return int(max(abs(a - b) for a, b in zip(found, (x, y, x + w, y + h))))
+
+def run_comparison(captures, config_names, repeats, tolerance):
+    results = {name: {"latencies": [], "cases": []} for name in config_names}
+    for path, expected in captures.items():
+        img = cv2.imread(path)
+        if img is None:
+            logging.warning(f"Could not read {path}")
+            continue
+        img = cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)  # Same layout as an mss capture
+
+        for name in config_names:
+            strategy, options = CONFIGS[name]
+            for _ in range(repeats):
+                # Fresh context so every run pays for its own gray and edge maps
+                ctx = FrameContext(img)
+                start = time.perf_counter()
+                bounds = find_window_bounds(ctx, strategy, **options)
+                results[name]["latencies"].append((time.perf_counter() - start) * 1000)
+            error = bounds_error(bounds, expected) if expected else None
+            results[name]["cases"].append({
+                "capture": os.path.basename(path),
+                "bounds": None if bounds is None else [bounds['x'], bounds['y'], bounds['width'], bounds['height']],
+                "expected": expected,
+                "error_px": error,
+                "hit": None if expected is None else error is not None and error <= tolerance,
+            })
+
+    report = []
+    for name in config_names:
+        latencies = results[name]["latencies"]
+        cases = results[name]["cases"]
+        scored = [c for c in cases if c["hit"] is not None]
+        p50, p95 = np.percentile(latencies, [50, 95]) if latencies else (0.0, 0.0)
+        report.append({
+            "config": name,
+            "strategy": CONFIGS[name][0],
+            "options": CONFIGS[name][1],
+            "latency_ms": {"p50": float(p50), "p95": float(p95), "samples": len(latencies)},
+            "accuracy": sum(c["hit"] for c in scored) / len(scored) if scored else None,
+            "cases": cases,
+        })
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare window bounds strategies")
+    parser.add_argument("captures", nargs="*", help="Full-monitor captures to compare (default: ground-truth fields)")
+    parser.add_argument("--config", action="append", choices=sorted(CONFIGS),
+                        help="Configuration to run (repeatable, default: all)")
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per capture")
+    parser.add_argument("--ground-truth", default=GROUND_TRUTH_PATH, help="Ground-truth JSON with field windows")
+    parser.add_argument("--tolerance", type=int, default=8, help="Max edge error (px) to count as correct")
+    parser.add_argument("--output", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    captures = load_captures(args.captures, args.ground_truth)
+    report = run_comparison(captures, args.config or list(CONFIGS), args.repeats, args.tolerance)
+
+    for result in report:
+        accuracy = "n/a" if result["accuracy"] is None else f"{result['accuracy']:.0%}"
+        logging.info(f"{result['config']:22s} p50 {result['latency_ms']['p50']:8.1f}ms  "
+                     f"p95 {result['latency_ms']['p95']:8.1f}ms  accuracy {accuracy}")
+        for case in result["cases"]:
+            logging.info(f"    {case['capture']:28s} bounds {case['bounds']}  error {case['error_px']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=4)
+        logging.info(f"Saved comparison: {args.output}")
+
+if __name__ == "__main__":
+    main()
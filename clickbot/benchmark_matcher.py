@@ -0,0 +1,185 @@
+"""
+Benchmark ImageMatcher configurations over the bundled clickbot/images corpus.
+
+Each configuration runs in its own worker process so peak RSS is measured per
+configuration. Every target is matched against one FrameContext per frame, as
+the bot's matchers share it, so latencies are per frame over all targets.
+Results are written as JSON for trend tracking.
+
+Usage: python benchmark_matcher.py [--repeats 5] [--output results.json]
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from image_matcher import ImageMatcher, BASE_DIR, TEMP_DIR
+import repo_root  # Shared helpers live at the repository root
+from frame_context import FrameContext
+
+IMAGE_DIR = os.path.join(BASE_DIR, "images")
+GROUND_TRUTH_PATH = os.path.join(IMAGE_DIR, "ground_truth.json")
+RESULTS_DIR = os.path.join(TEMP_DIR, "benchmarks")
+
+# Minimum score for a position to count as a candidate
+MIN_CONFIDENCE = 0.5
+
+# name -> find_candidates options; "roi" searches a window around the expected center
+CONFIGS = {
+    "full": {"domain": "bgr"},
+    "full-no-nms": {"domain": "bgr", "nms": False},
+    "pyramid": {"domain": "bgr", "pyramid_levels": 2},
+    "roi": {"domain": "bgr", "roi": True},
+    "gray": {"domain": "gray"},
+    "gray-pyramid": {"domain": "gray", "pyramid_levels": 2},
+    "clahe": {"domain": "clahe"},
+    "edge": {"domain": "edge"},
+    "edge-no-nms": {"domain": "edge", "nms": False},
+}
+
+def load_ground_truth(path=GROUND_TRUTH_PATH):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def roi_around(center, matcher, scale=4):
+    """ROI of `scale` times the target size centered on the expected hit."""
+    w, h = matcher.target_width * scale, matcher.target_height * scale
+    return (center[0] - w // 2, center[1] - h // 2, w, h)
+
+def run_config(job):
+    """Run one configuration over every field/target pair; executed in a worker process."""
+    name, options, repeats, ground_truth = job
+    options = dict(options)
+    use_roi = options.pop("roi", False)
+    tolerance = ground_truth["tolerance_px"]
+
+    screens = {
+        field: np.array(Image.open(os.path.join(IMAGE_DIR, field)).convert('RGB'))
+        for field in ground_truth["fields"]
+    }
+
+    matchers = {}
+    for target_name, target_info in ground_truth["targets"].items():
+        matcher = ImageMatcher(threshold=MIN_CONFIDENCE)
+        matcher.load_target(os.path.join(IMAGE_DIR, target_name), scale=target_info.get("scale", 1.0))
+        matchers[target_name] = matcher
+
+    latencies = []
+    candidate_counts = []
+    cases = []
+    for field, expected in ground_truth["fields"].items():
+        center = expected["center"]
+        rois = {name: roi_around(center, matcher) if use_roi and center else None
+                for name, matcher in matchers.items()}
+
+        for _ in range(repeats):
+            # A fresh context per repeat, so every repeat pays for its own frame conversions
+            start = time.perf_counter()
+            ctx = FrameContext(screens[field], color_order="rgb")
+            results = {
+                name: matcher.find_candidates(ctx, roi=rois[name], min_confidence=MIN_CONFIDENCE,
+                                              max_candidates=None, **options)
+                for name, matcher in matchers.items()
+            }
+            latencies.append((time.perf_counter() - start) * 1000)
+
+        for target_name, matcher in matchers.items():
+            candidates = results[target_name]
+            candidate_counts.append(len(candidates))
+
+            found = None
+            if candidates:
+                x, y, score = candidates[0]
+                found = [x + matcher.target_width // 2, y + matcher.target_height // 2]
+            if center is None:
+                hit = found is None
+            else:
+                hit = found is not None and max(abs(found[0] - center[0]), abs(found[1] - center[1])) <= tolerance
+            cases.append({
+                "field": field,
+                "target": target_name,
+                "expected": center,
+                "found": found,
+                "score": candidates[0][2] if candidates else None,
+                "candidates": len(candidates),
+                "hit": hit,
+            })
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "config": name,
+        "options": job[1],
+        "latency_ms": {"p50": float(p50), "p95": float(p95), "p99": float(p99),
+                       "mean": float(np.mean(latencies)), "samples": len(latencies)},
+        "peak_rss_mb": peak_rss_mb(),
+        "candidates": {"mean": float(np.mean(candidate_counts)), "max": int(max(candidate_counts))},
+        "accuracy": sum(c["hit"] for c in cases) / len(cases),
+        "cases": cases,
+    }
+
+def run_benchmark(config_names=None, repeats=5, ground_truth_path=GROUND_TRUTH_PATH):
+    if repeats < 1:
+        raise ValueError(f"repeats must be at least 1, got {repeats}")
+    ground_truth = load_ground_truth(ground_truth_path)
+    names = config_names or list(CONFIGS)
+    results = []
+
+    # One fresh process per configuration, run serially so timings don't interfere
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        for name in names:
+            result = pool.apply(run_config, ((name, CONFIGS[name], repeats, ground_truth),))
+            latency = result["latency_ms"]
+            logging.info(f"{name:14s} p50 {latency['p50']:8.1f}ms  p95 {latency['p95']:8.1f}ms  "
+                         f"p99 {latency['p99']:8.1f}ms  rss {result['peak_rss_mb']:7.1f}MB  "
+                         f"candidates {result['candidates']['mean']:8.1f}  accuracy {result['accuracy']:.0%}")
+            results.append(result)
+
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "opencv": cv2.__version__,
+        "repeats": repeats,
+        "min_confidence": MIN_CONFIDENCE,
+        "results": results,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ImageMatcher configurations")
+    parser.add_argument("--config", action="append", choices=sorted(CONFIGS),
+                        help="Configuration to run (repeatable, default: all)")
+    parser.add_argument("--repeats", type=int, default=5, help="Runs per field/target pair")
+    parser.add_argument("--ground-truth", default=GROUND_TRUTH_PATH, help="Ground-truth JSON of expected centers")
+    parser.add_argument("--output", help="Results JSON path (default: temp/benchmarks/matcher_<timestamp>.json)")
+    args = parser.parse_args()
+    if args.repeats < 1:
+        parser.error("--repeats must be at least 1")
+
+    report = run_benchmark(args.config, args.repeats, args.ground_truth)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"matcher_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=4)
+    logging.info(f"Saved benchmark results: {output}")
+
+if __name__ == "__main__":
+    main()
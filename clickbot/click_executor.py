@@ -0,0 +1,161 @@
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+import pyautogui
+
+@dataclass
+class ClickCommand:
+    """One queued mouse action: "move", "click" or "restore"."""
+    kind: str
+    x: int = 0
+    y: int = 0
+    detected_at: Optional[float] = None
+    save_position: bool = False  # For clicks: remember the pointer so "restore" can return it
+
+@dataclass
+class ClickTiming:
+    """Timestamps for one click: detected -> issued -> completed."""
+    x: int
+    y: int
+    detected_at: float
+    issued_at: float
+    completed_at: float
+
+    @property
+    def queue_latency(self) -> float:
+        """Seconds from detection until the actuator started the click."""
+        return self.issued_at - self.detected_at
+
+    @property
+    def actuation_time(self) -> float:
+        """Seconds spent moving and clicking."""
+        return self.completed_at - self.issued_at
+
+    @property
+    def total_latency(self) -> float:
+        return self.completed_at - self.detected_at
+
+class ClickExecutor:
+    """Performs mouse moves and clicks on a dedicated thread.
+
+    Callers enqueue commands and return immediately, so detection keeps
+    running while the pointer moves. A click is dropped if another click
+    within `dedupe_radius` pixels is still pending or completed less than
+    `cooldown` seconds ago, so a button that stays visible for a few polls
+    after being clicked is not clicked again.
+    """
+
+    def __init__(self, move_duration: float = 0.2, settle_delay: float = 0.1,
+                 restore_duration: float = 0.1, dedupe_radius: int = 5, history: int = 100,
+                 cooldown: float = 1.0):
+        self.move_duration = move_duration
+        self.settle_delay = settle_delay
+        self.restore_duration = restore_duration
+        self.dedupe_radius = dedupe_radius
+        self.cooldown = cooldown
+        self.timings: Deque[ClickTiming] = deque(maxlen=history)
+        self._commands: "queue.Queue[Optional[ClickCommand]]" = queue.Queue()
+        self._pending: Dict[int, Tuple[int, int]] = {}  # id(command) -> target of queued clicks
+        self._recent: Deque[Tuple[float, int, int]] = deque()  # (completed_at, x, y) within the cooldown
+        self._lock = threading.Lock()
+        self._saved_position: Optional[Tuple[int, int]] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="click-executor", daemon=True)
+            self._thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop after the queued commands have run."""
+        if self._thread is not None and self._thread.is_alive():
+            self._commands.put(None)
+            if wait:
+                self._thread.join()
+
+    def wait_idle(self):
+        """Block until every queued command has completed."""
+        self._commands.join()
+
+    @property
+    def pending_clicks(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def move(self, x: int, y: int):
+        self.start()
+        self._commands.put(ClickCommand("move", x, y))
+
+    def restore_position(self):
+        """Return the pointer to where it was before the last position-saving click."""
+        self.start()
+        self._commands.put(ClickCommand("restore"))
+
+    def click(self, x: int, y: int, detected_at: Optional[float] = None, restore: bool = True) -> bool:
+        """Queue a click at (x, y); returns False if it duplicates a pending or recent click."""
+        self.start()
+        command = ClickCommand("click", x, y, detected_at or time.time(), save_position=restore)
+        with self._lock:
+            expired = time.time() - self.cooldown
+            while self._recent and self._recent[0][0] < expired:
+                self._recent.popleft()
+            for px, py in list(self._pending.values()) + [(rx, ry) for _, rx, ry in self._recent]:
+                if abs(px - x) <= self.dedupe_radius and abs(py - y) <= self.dedupe_radius:
+                    logging.debug(f"Skipping duplicate click at ({x}, {y})")
+                    return False
+            self._pending[id(command)] = (x, y)
+            self._commands.put(command)
+            if restore:
+                self._commands.put(ClickCommand("restore"))
+        return True
+
+    def latency_summary(self) -> str:
+        timings: List[ClickTiming] = list(self.timings)
+        if not timings:
+            return "no clicks yet"
+        avg = lambda values: sum(values) / len(values) * 1000
+        return (f"{len(timings)} clicks, detected->issued {avg([t.queue_latency for t in timings]):.0f}ms, "
+                f"issued->completed {avg([t.actuation_time for t in timings]):.0f}ms")
+
+    def _run(self):
+        while True:
+            command = self._commands.get()
+            try:
+                if command is None:
+                    return
+                self._execute(command)
+            except Exception as e:
+                logging.error(f"Error during {command.kind} operation: {str(e)}")
+            finally:
+                if command is not None:
+                    with self._lock:
+                        self._pending.pop(id(command), None)
+                self._commands.task_done()
+
+    def _execute(self, command: ClickCommand):
+        if command.kind == "move":
+            pyautogui.moveTo(command.x, command.y, duration=self.move_duration)
+        elif command.kind == "restore":
+            if self._saved_position is not None:
+                pyautogui.moveTo(*self._saved_position, duration=self.restore_duration)
+                self._saved_position = None
+        elif command.kind == "click":
+            issued_at = time.time()
+            if command.save_position:
+                position = pyautogui.position()
+                self._saved_position = (position[0], position[1])
+            pyautogui.moveTo(command.x, command.y, duration=self.move_duration)
+            time.sleep(self.settle_delay)
+            pyautogui.click(command.x, command.y)
+            timing = ClickTiming(command.x, command.y, command.detected_at, issued_at, time.time())
+            self.timings.append(timing)
+            with self._lock:
+                self._recent.append((timing.completed_at, command.x, command.y))
+            logging.info(f"Clicked ({command.x}, {command.y}): detected->issued {timing.queue_latency * 1000:.0f}ms, "
+                         f"issued->completed {timing.actuation_time * 1000:.0f}ms")
+        else:
+            raise ValueError(f"Unknown click command '{command.kind}'")
@@ -1,19 +1,26 @@
-import cv2
 import numpy as np
 import pyautogui
 import time
 import logging
 import os
+import argparse
 from image_matcher import ImageMatcher
+from click_executor import ClickExecutor
+from poll_scheduler import AdaptivePollScheduler
 from datetime import datetime
 
 # Configure PyAutoGUI
 pyautogui.FAILSAFE = True  # Move mouse to corner to abort
 pyautogui.PAUSE = 0.1  # Add small delay between actions
 
+def display_scale():
+    """Screenshot pixels per screen point: 2.0 on Retina displays, 1.0 on standard ones."""
+    return pyautogui.screenshot().size[0] / pyautogui.size()[0]
+
 class ClickBot:
-    def __init__(self):
+    def __init__(self, scale=None):
         self.matcher = ImageMatcher(threshold=0.85)  # Higher threshold for more precision
+        self.clicker = ClickExecutor()
         
         # Load target image once at startup
         self.target_path = os.path.join(os.path.dirname(__file__), "images", "target.png")
@@ -32,50 +39,46 @@ class ClickBot:
             ]
         )
         
-        # Create temp directory if it doesn't exist
-        self.temp_dir = os.path.join(os.path.dirname(__file__), "temp")
-        os.makedirs(self.temp_dir, exist_ok=True)
+        # Screenshots are in physical pixels, so the template (captured in
+        # points) is scaled up and click positions scaled back down
+        self.scale = scale or display_scale()
+        logging.info(f"Display scale: {self.scale:g}")
         
         # Load and preprocess target image once
-        self.target_image = cv2.imread(self.target_path)
-        if self.target_image is None:
+        if not self.matcher.load_target(self.target_path, scale=self.scale):
             raise ValueError(f"Failed to load target image: {self.target_path}")
+        self.target_image = self.matcher.target_asset.bgr
     
     def capture_screen(self):
         """Capture the current screen."""
         try:
-            screenshot = pyautogui.screenshot()
-            return cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            # Kept in RGB, the channel order ImageMatcher expects of frames
+            return np.array(pyautogui.screenshot())
         except Exception as e:
             logging.error(f"Error capturing screen: {str(e)}")
             return None
     
-    def click_target(self, match):
-        """Click at the center of the matched target."""
+    def click_target(self, match, detected_at=None):
+        """Queue a click at the center of the matched target."""
         try:
-            # Get current mouse position
-            current_x, current_y = pyautogui.position()
-            
-            # Only move and click if we're not already at the target
-            if abs(current_x - match.center_x) > 5 or abs(current_y - match.center_y) > 5:
-                # Move to target center and click
-                pyautogui.moveTo(match.center_x, match.center_y, duration=0.2)
-                pyautogui.click()
-                
-                logging.info(f"Clicked target at ({match.center_x}, {match.center_y}) with confidence {match.confidence:.2f}")
+            x, y = round(match.center_x / self.scale), round(match.center_y / self.scale)
+            # Clicks on a still-pending or just-clicked target are dropped by the executor
+            if self.clicker.click(x, y, detected_at=detected_at, restore=False):
+                logging.info(f"Queued click at ({x}, {y}) with confidence {match.confidence:.2f}")
                 return True
             return False
         except Exception as e:
             logging.error(f"Error clicking target: {str(e)}")
             return False
     
-    def run(self, check_interval=1.0):
-        """Run the clickbot continuously."""
+    def run(self, check_interval=1.0, min_interval=0.05):
+        """Run the clickbot continuously, polling faster while the screen is active."""
         logging.info("Starting ClickBot...")
         logging.info(f"Using target image: {self.target_path}")
         
         last_click_time = 0
         consecutive_fails = 0
+        scheduler = AdaptivePollScheduler(floor_interval=min_interval, ceiling_interval=check_interval)
         
         while True:
             try:
@@ -91,13 +94,9 @@ class ClickBot:
                     time.sleep(check_interval)
                     continue
                 
-                # Save screen to temp file for matcher
-                temp_screen_path = os.path.join(self.temp_dir, "current_screen.png")
-                cv2.imwrite(temp_screen_path, screen)
-                
-                # Find matches
-                self.matcher.load_images(temp_screen_path, self.target_path)
-                matches = self.matcher.find_matches()
+                # Find matches in the captured frame
+                matches = self.matcher.find_matches(screen, nms=True, min_confidence=self.matcher.threshold)
+                accept_seen = False
                 
                 if matches:
                     # Sort matches by quality
@@ -110,35 +109,38 @@ class ClickBot:
                     
                     # Get best match
                     best_match = matches[0]
+                    detected_at = time.time()
+                    accept_seen = best_match.confidence > 0.9
                     
                     # Only click if we're very confident and enough time has passed since last click
                     current_time = time.time()
                     if (best_match.confidence > 0.9 and 
                         best_match.quality.structural_similarity > 0.8 and
                         current_time - last_click_time > 2.0):
-                        if self.click_target(best_match):
+                        # The executor clicks on its own thread; keep polling meanwhile
+                        if self.click_target(best_match, detected_at):
                             last_click_time = current_time
                             consecutive_fails = 0
-                            time.sleep(1.0)  # Short delay after successful click
-                            continue
                 
-                # Wait before next check
-                time.sleep(check_interval)
+                # Wait before next check; shorter while the screen is changing
+                scheduler.observe(screen, accept_seen=accept_seen)
+                scheduler.sleep()
                 
             except KeyboardInterrupt:
                 logging.info("ClickBot stopped by user")
+                logging.info(f"Click latency: {self.clicker.latency_summary()}")
+                logging.info(f"Poll scheduler: {scheduler.stats()}")
+                self.clicker.stop()
                 break
             except Exception as e:
                 logging.error(f"Error in main loop: {str(e)}")
                 consecutive_fails += 1
                 time.sleep(check_interval)
-        
-        # Cleanup
-        try:
-            os.remove(os.path.join(self.temp_dir, "current_screen.png"))
-        except:
-            pass
 
 if __name__ == "__main__":
-    bot = ClickBot()
+    parser = argparse.ArgumentParser(description="Click the target image whenever it appears")
+    parser.add_argument("--scale", type=float,
+                        help="Screenshot pixels per screen point (default: detected from the display)")
+    args = parser.parse_args()
+    bot = ClickBot(scale=args.scale)
     bot.run() 
\ No newline at end of file
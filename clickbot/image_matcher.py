@@ -5,12 +5,18 @@ import logging
 import time
 from datetime import datetime
 from dataclasses import dataclass
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, NamedTuple, Optional
 from statistics import mean, stdev
 import shutil
 import pyautogui
 import gc
+import heapq
+import queue
+import threading
 from PIL import Image
+from template_registry import get_template
+import repo_root  # Shared helpers live at the repository root
+from frame_context import FrameContext
 
 # Set up directory structure
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -32,6 +38,12 @@ logging.basicConfig(
     ]
 )
 
+# Image domains find_matches can correlate in (compare them with benchmark_matcher.py)
+MATCH_DOMAINS = ("bgr", "gray", "clahe", "edge")
+
+# Chamfer distances are capped so one missing edge doesn't dominate the score
+EDGE_DISTANCE_CAP = 10.0
+
 @dataclass
 class MatchQuality:
     structural_similarity: float  # SSIM score
@@ -63,11 +75,90 @@ class Match:
         """Calculate center y coordinate."""
         return self.y + self.height // 2
 
+class MatchMarker(NamedTuple):
+    """Immutable snapshot of the fields visualization draws for one match."""
+    x: int
+    y: int
+    width: int
+    height: int
+    confidence: float
+    ssim: float
+
+class VisualizationWorker:
+    """Renders and writes debug images on a background thread.
+
+    Jobs are dropped rather than queued when the worker falls behind, so the
+    detection loop never waits on drawing or disk I/O.
+    """
+
+    def __init__(self, max_pending=2):
+        self._jobs = queue.Queue(maxsize=max_pending)
+        self._thread = None
+        self.dropped = 0
+
+    def submit(self, image: np.ndarray, markers: Tuple[MatchMarker, ...], output_path: str, scale: float) -> bool:
+        """Queue markers to be drawn on `image`, the screen already resized by `scale`.
+
+        The worker draws on `image` itself, so the caller must hand over its own copy.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="match-visualizer", daemon=True)
+            self._thread.start()
+        try:
+            self._jobs.put_nowait((image, markers, output_path, scale))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            logging.debug(f"Visualization queue full, dropped {output_path}")
+            return False
+
+    def flush(self):
+        """Block until every queued image has been written."""
+        self._jobs.join()
+
+    def _run(self):
+        while True:
+            image, markers, output_path, scale = self._jobs.get()
+            try:
+                cv2.imwrite(output_path, self._render(image, markers, scale))
+            except Exception as e:
+                logging.warning(f"Error writing visualization {output_path}: {str(e)}")
+            finally:
+                self._jobs.task_done()
+
+    @staticmethod
+    def _render(vis_image: np.ndarray, markers: Tuple[MatchMarker, ...], scale: float) -> np.ndarray:
+        for idx, m in enumerate(markers):
+            center = (int((m.x + m.width // 2) * scale), int((m.y + m.height // 2) * scale))
+            
+            # Draw red dot at match center
+            cv2.circle(vis_image, center, 5, (0, 0, 255), -1)
+            
+            # Draw confidence score above and SSIM below the dot
+            cv2.putText(vis_image, f"#{idx+1} Conf: {m.confidence:.2f}",
+                       (center[0] - 40, center[1] - 10),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+            cv2.putText(vis_image, f"SSIM: {m.ssim:.2f}",
+                       (center[0] - 40, center[1] + 20),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
+            
+            # Draw rectangle around match region
+            cv2.rectangle(vis_image,
+                         (int(m.x * scale), int(m.y * scale)),
+                         (int((m.x + m.width) * scale), int((m.y + m.height) * scale)),
+                         (0, 255, 0), 2)
+        return vis_image
+
 class ImageMatcher:
-    def __init__(self, threshold=0.1):
+    def __init__(self, threshold=0.1, domain="bgr"):
+        if domain not in MATCH_DOMAINS:
+            raise ValueError(f"Unknown matching domain '{domain}', expected one of {MATCH_DOMAINS}")
         self.threshold = threshold
+        self.domain = domain
         self.screen_image = None
         self.target_image = None
+        self.target = None
+        self.target_asset = None
         self.screen_gray = None
         self.target_gray = None
         self.debug_dir = DEBUG_DIR
@@ -75,6 +166,9 @@ class ImageMatcher:
         # Cache for preprocessed images
         self._preprocessed_cache = {}
         
+        # Domain conversions of the loaded target
+        self._target_domains = {}
+        
         # Reduced scales for better performance
         self.scales = [0.95, 1.0, 1.05]
         
@@ -96,6 +190,9 @@ class ImageMatcher:
         
         # Initialize CLAHE for preprocessing
         self.clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8,8))
+        
+        # Debug images are rendered off the detection thread
+        self.visualizer = VisualizationWorker()
 
     def capture_screen(self):
         """Capture the current screen."""
@@ -134,62 +231,258 @@ class ImageMatcher:
             logging.error(traceback.format_exc())
             raise
 
-    def load_target(self, target_path: str):
-        """Load target image to search for."""
+    def load_target(self, target_path: str, scale: float = 1.0, save_debug: bool = False):
+        """Load target image to search for, resized by `scale` (e.g. 2.0 for Retina captures)."""
         try:
-            # Load target image using PIL to match raw screenshot format
-            target_img = Image.open(target_path)
-            target_img = target_img.convert('RGB')  # Ensure RGB format
-            self.target = np.array(target_img)
-            
-            # Log target image details
-            logging.info(f"Loaded target image {target_path}: {self.target.shape}")
+            # Variants are loaded once per process and shared through the registry
+            self.target_asset = get_template(target_path, scale)
+            self.target = self.target_asset.rgb
             self.target_height, self.target_width = self.target.shape[:2]
-            logging.info(f"Target dimensions: {self.target_width}x{self.target_height}")
-            
-            # Save normalized version for debugging
-            debug_path = os.path.join(os.path.dirname(target_path), "target-norm.png")
-            Image.fromarray(self.target).save(debug_path)
-            logging.info(f"Saved normalized target image: {debug_path}")
+            logging.debug(f"Target {target_path}: {self.target_width}x{self.target_height}")
+            self._target_domains = {
+                "bgr": self.target_asset.bgr,
+                "gray": self.target_asset.gray,
+                "clahe": self.preprocess_image(self.target_asset.gray),
+                "edge": self.target_asset.edges,
+            }
+            
+            if save_debug:
+                # Save normalized version for debugging
+                debug_path = os.path.join(self.debug_dir, "target-norm.png")
+                Image.fromarray(self.target).save(debug_path)
+                logging.info(f"Saved normalized target image: {debug_path}")
             
             return True
         except Exception as e:
             logging.error(f"Error loading target image: {str(e)}")
             return False
             
-    def find_matches(self, screen):
+    def frame_context(self, screen) -> FrameContext:
+        """Wrap an RGB frame (array or PIL image) for matching.
+
+        Conversions are memoized on the context, so build one FrameContext per
+        frame and pass it to every matcher that looks at that frame.
+        """
+        if isinstance(screen, FrameContext):
+            return screen
+        image = np.array(screen) if isinstance(screen, Image.Image) else screen
+        return FrameContext(image, color_order="rgb")
+
+    def frame_domain(self, screen, domain: str) -> np.ndarray:
+        """Get a domain conversion of the frame, computing it at most once per frame."""
+        ctx = self.frame_context(screen)
+        if domain == "bgr":
+            return ctx.bgr()
+        if domain == "gray":
+            return ctx.gray()
+        if domain == "clahe":
+            # Same steps as preprocess_image(), on the CLAHE image other detectors share
+            return ctx.memo(("match", "clahe"), lambda: cv2.GaussianBlur(ctx.clahe(), (3, 3), 0))
+        if domain == "edge":
+            def compute():
+                # Distance to the nearest frame edge, for chamfer scoring
+                edges = cv2.Canny(ctx.gray(), 50, 150)
+                dist = cv2.distanceTransform(cv2.bitwise_not(edges), cv2.DIST_L2, 3)
+                return np.minimum(dist, EDGE_DISTANCE_CAP)
+            return ctx.memo(("match", "edge"), compute)
+        raise ValueError(f"Unknown matching domain '{domain}'")
+
+    def _score(self, frame: np.ndarray, template: np.ndarray, domain: str) -> np.ndarray:
+        """Correlate a template over a frame in the given domain."""
+        if domain != "edge":
+            return cv2.matchTemplate(frame, template, cv2.TM_CCOEFF_NORMED)
+            
+        # Chamfer score: mean capped distance from template edges to frame edges
+        edge_weight = float(template.sum())
+        if edge_weight == 0:
+            return np.zeros((frame.shape[0] - template.shape[0] + 1,
+                             frame.shape[1] - template.shape[1] + 1), dtype=np.float32)
+        distance_sum = cv2.matchTemplate(frame, template, cv2.TM_CCORR)
+        return 1.0 - distance_sum / (edge_weight * EDGE_DISTANCE_CAP)
+
+    def _frame_level(self, ctx: FrameContext, domain: str, level: int) -> np.ndarray:
+        """Frame domain image downscaled `level` times by pyrDown, cached per frame."""
+        if level == 0:
+            return self.frame_domain(ctx, domain)
+        if domain == "gray":
+            return ctx.pyramid(level)
+        return ctx.memo(("match", domain, level), lambda: cv2.pyrDown(self._frame_level(ctx, domain, level - 1)))
+
+    def _target_level(self, domain: str, level: int) -> np.ndarray:
+        if level == 0:
+            return self._target_domains[domain]
+        pyramid = self.target_asset.pyramids.get(domain, ())
+        if level < len(pyramid):
+            return pyramid[level]
+        key = f"{domain}@{level}"
+        if key not in self._target_domains:
+            self._target_domains[key] = cv2.pyrDown(self._target_level(domain, level - 1))
+        return self._target_domains[key]
+
+    def _window_sums(self, frame: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Sum and sum of squares of the frame under the target placed at each top-left position."""
+        size = (self.target_width, self.target_height)
+        options = dict(normalize=False, anchor=(0, 0), borderType=cv2.BORDER_CONSTANT)
+        return (cv2.boxFilter(frame, cv2.CV_64F, size, **options),
+                cv2.sqrBoxFilter(frame, cv2.CV_64F, size, **options))
+
+    def _normalized_correlation(self, ctx: FrameContext, roi) -> np.ndarray:
+        """TM_CCOEFF_NORMED of the gray target, from its mean/std computed at load.
+
+        Since sum((f - f_mean) * (t - t_mean)) = sum(f * t) - t_mean * sum(f),
+        a plain correlation plus per-window frame sums gives the same scores.
+        The full-frame sums are shared by every matcher with a same-sized target.
+        """
+        asset = self.target_asset
+        frame = ctx.gray()
+        if roi is None:
+            sums, sq_sums = ctx.memo(("match", "window_sums", self.target_width, self.target_height),
+                                     lambda: self._window_sums(frame))
+        else:
+            x, y, w, h = roi
+            frame = frame[y:y + h, x:x + w]
+            sums, sq_sums = self._window_sums(frame)
+            
+        score = cv2.matchTemplate(frame, asset.gray, cv2.TM_CCORR)
+        if asset.gray_std == 0:
+            # A flat template correlates with nothing
+            return np.zeros_like(score)
+        rows, cols = score.shape
+        sums, sq_sums = sums[:rows, :cols], sq_sums[:rows, :cols]
+        n = self.target_width * self.target_height
+        score = cv2.scaleAdd(sums.astype(np.float32), -asset.gray_mean, score)
+        variance = cv2.subtract(sq_sums, cv2.multiply(sums, sums, scale=1.0 / n))
+        deviation = cv2.sqrt(np.maximum(variance, 0).astype(np.float32))
+        score = cv2.divide(score, deviation, scale=1.0 / (asset.gray_std * np.sqrt(n)))
+        # Flat frame windows (e.g. empty background) have no defined correlation
+        score[deviation < 1e-3] = 0
+        return score
+
+    def match_map(self, screen, domain: str = None, roi: Optional[Tuple[int, int, int, int]] = None) -> np.ndarray:
+        """Score every target position in the frame (or an (x, y, w, h) ROI of it); 1.0 is a perfect match."""
+        domain = domain or self.domain
+        screen = self.frame_context(screen)
+        if domain == "gray":
+            return self._normalized_correlation(screen, roi)
+        frame = self.frame_domain(screen, domain)
+        if roi is not None:
+            x, y, w, h = roi
+            frame = frame[y:y + h, x:x + w]
+        return self._score(frame, self._target_domains[domain], domain)
+
+    def _clamp_roi(self, roi, frame_shape):
+        """Clip an ROI to the frame; None if the target no longer fits inside it."""
+        x, y, w, h = roi
+        x1, y1 = max(0, x), max(0, y)
+        x2, y2 = min(frame_shape[1], x + w), min(frame_shape[0], y + h)
+        if x2 - x1 < self.target_width or y2 - y1 < self.target_height:
+            return None
+        return x1, y1, x2 - x1, y2 - y1
+
+    def _peaks(self, result: np.ndarray, min_confidence: float, nms: bool, max_candidates: Optional[int],
+               template_shape: Tuple[int, int], offset=(0, 0)) -> List[Tuple[int, int, float]]:
+        """Turn a score map into (x, y, score) candidates, best first."""
+        if nms:
+            # Keep only local maxima within one template footprint
+            kernel = np.ones(template_shape[:2], dtype=np.uint8)
+            mask = (result >= cv2.dilate(result, kernel)) & (result >= min_confidence)
+        else:
+            mask = result >= min_confidence
+        ys, xs = np.nonzero(mask)
+        scores = result[ys, xs]
+        order = np.argsort(-scores, kind="stable")
+        if max_candidates:
+            order = order[:max_candidates]
+        return [(int(xs[i]) + offset[0], int(ys[i]) + offset[1], float(scores[i])) for i in order]
+
+    def find_candidates(self, screen, domain: str = None, roi: Optional[Tuple[int, int, int, int]] = None,
+                        pyramid_levels: int = 0, nms: bool = True, min_confidence: float = None,
+                        max_candidates: Optional[int] = 50) -> List[Tuple[int, int, float]]:
+        """Find target positions as (x, y, score), best first, without computing match quality.
+
+        `screen` is an RGB frame or a FrameContext shared with other matchers.
+        `roi` limits the search to an (x, y, w, h) region of the frame.
+        `pyramid_levels` > 0 searches a pyrDown'd frame first and refines each
+        coarse peak at full resolution. `nms` keeps only local maxima.
+        """
+        if self.target is None:
+            logging.error("Target image not loaded")
+            return []
+        domain = domain or self.domain
+        min_confidence = self.threshold if min_confidence is None else min_confidence
+        screen = self.frame_context(screen)
+        frame = self.frame_domain(screen, domain)
+        if roi is not None:
+            roi = self._clamp_roi(roi, frame.shape)
+            if roi is None:
+                return []
+                
+        if pyramid_levels > 0:
+            template = self._target_level(domain, pyramid_levels)
+            if min(template.shape[:2]) >= 4:
+                return self._pyramid_candidates(screen, domain, roi, pyramid_levels, nms,
+                                                min_confidence, max_candidates)
+            logging.debug(f"Target too small for {pyramid_levels} pyramid levels, searching full resolution")
+            
+        offset = roi[:2] if roi is not None else (0, 0)
+        result = self.match_map(screen, domain, roi)
+        return self._peaks(result, min_confidence, nms, max_candidates,
+                           self._target_domains[domain].shape, offset)
+
+    def _pyramid_candidates(self, screen, domain, roi, levels, nms, min_confidence, max_candidates):
+        factor = 2 ** levels
+        coarse = self._frame_level(screen, domain, levels)
+        template = self._target_level(domain, levels)
+        offset = (0, 0)
+        if roi is not None:
+            x, y, w, h = roi
+            offset = (x // factor, y // factor)
+            coarse = coarse[offset[1]:(y + h) // factor, offset[0]:(x + w) // factor]
+            if coarse.shape[0] < template.shape[0] or coarse.shape[1] < template.shape[1]:
+                return []
+                
+        # Coarse scores run lower than full resolution ones, so relax the threshold
+        coarse_peaks = self._peaks(self._score(coarse, template, domain), min_confidence * 0.75,
+                                   True, max_candidates or 50, template.shape, offset)
+        
+        frame_shape = self.frame_domain(screen, domain).shape
+        candidates = {}
+        for cx, cy, _ in coarse_peaks:
+            # Re-match in a small full resolution window around each coarse peak
+            window = self._clamp_roi((cx * factor - factor, cy * factor - factor,
+                                      self.target_width + 2 * factor, self.target_height + 2 * factor),
+                                     frame_shape)
+            if window is None:
+                continue
+            for x, y, score in self.find_candidates(screen, domain, window, 0, nms, min_confidence, 1 if nms else None):
+                candidates[(x, y)] = max(score, candidates.get((x, y), score))
+                
+        ranked = sorted(((x, y, score) for (x, y), score in candidates.items()), key=lambda c: -c[2])
+        return ranked[:max_candidates] if max_candidates else ranked
+
+    def find_matches(self, screen, domain: str = None, roi: Optional[Tuple[int, int, int, int]] = None,
+                     pyramid_levels: int = 0, nms: bool = False, min_confidence: float = 0.001):
         """Find all matches in the screen image."""
         if self.target is None:
             logging.error("Target image not loaded")
             return []
             
+        domain = domain or self.domain
         try:
-            # Ensure screen is in correct format
-            if isinstance(screen, Image.Image):
-                screen = np.array(screen)
-            
-            # Convert both images to BGR for OpenCV
-            if len(screen.shape) == 3 and screen.shape[2] == 3:
-                screen_bgr = cv2.cvtColor(screen, cv2.COLOR_RGB2BGR)
-            else:
-                screen_bgr = screen
-                
-            target_bgr = cv2.cvtColor(self.target, cv2.COLOR_RGB2BGR)
+            screen = self.frame_context(screen)
+            screen_bgr = self.frame_domain(screen, "bgr")
+            target_bgr = self._target_domains["bgr"]
                 
             # Log shapes for debugging
-            logging.info(f"Screen shape: {screen_bgr.shape}, Target shape: {target_bgr.shape}")
-            logging.info(f"Screen dtype: {screen_bgr.dtype}, Target dtype: {target_bgr.dtype}")
+            logging.info(f"Screen shape: {screen_bgr.shape}, Target shape: {target_bgr.shape}, domain: {domain}")
             
             # Perform template matching
-            result = cv2.matchTemplate(screen_bgr, target_bgr, cv2.TM_CCOEFF_NORMED)
-            
-            # Get all matches above minimum threshold
-            locations = np.where(result >= 0.001)  # Very low threshold to see all potential matches
+            candidates = self.find_candidates(screen, domain, roi, pyramid_levels, nms,
+                                              min_confidence, max_candidates=None)
+            method = "CHAMFER" if domain == "edge" else "TM_CCOEFF_NORMED"
             matches = []
             
-            for pt in zip(*locations[::-1]):
-                x, y = pt
-                confidence = result[y, x]
+            for x, y, confidence in candidates:
                 
                 # Extract regions for quality calculation
                 screen_region = screen_bgr[y:y+target_bgr.shape[0], x:x+target_bgr.shape[1]]
@@ -205,14 +498,14 @@ class ImageMatcher:
                     y=y,
                     width=self.target_width,
                     height=self.target_height,
-                    confidence=confidence,
-                    method="TM_CCOEFF_NORMED",
+                    confidence=float(confidence),
+                    method=f"{method}/{domain}",
                     scale=1.0,
                     quality=quality
                 )
                 matches.append(match)
                 
-            logging.info(f"Found {len(matches)} potential matches with confidence >= 0.001")
+            logging.info(f"Found {len(matches)} potential matches with confidence >= {min_confidence}")
             if matches:
                 best_match = max(matches, key=lambda m: m.confidence)
                 logging.info(f"Best match confidence: {best_match.confidence:.4f}")
@@ -227,39 +520,34 @@ class ImageMatcher:
             logging.error(traceback.format_exc())
             return []
 
-    def visualize_matches(self, matches: List[Match], output_path: str):
-        """Create a debug image showing all matches with confidence scores."""
-        # Create a copy of the screen image
-        vis_image = self.screen_image.copy()
-        
-        # Sort matches by confidence for better visualization
-        matches.sort(key=lambda x: x.confidence, reverse=True)
-        
-        # Draw matches
-        for idx, match in enumerate(matches):
-            # Draw red dot at match center
-            cv2.circle(vis_image, (match.center_x, match.center_y), 5, (0, 0, 255), -1)
-            
-            # Draw confidence score above the dot
-            conf_text = f"#{idx+1} Conf: {match.confidence:.2f}"
-            cv2.putText(vis_image, conf_text, 
-                       (match.center_x - 40, match.center_y - 10),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-            
-            # Draw quality metrics below the dot
-            quality_text = f"SSIM: {match.quality.structural_similarity:.2f}"
-            cv2.putText(vis_image, quality_text,
-                       (match.center_x - 40, match.center_y + 20),
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 255), 1)
-            
-            # Draw rectangle around match region
-            cv2.rectangle(vis_image, 
-                         (match.x, match.y),
-                         (match.x + match.width, match.y + match.height),
-                         (0, 255, 0), 2)
+    def visualize_matches(self, matches: List[Match], output_path: str, max_matches: int = 20,
+                          scale: float = 0.5, screen: Optional[np.ndarray] = None) -> bool:
+        """Queue a debug image of the top matches; returns False if it was dropped.
 
-        # Save the visualization
-        cv2.imwrite(output_path, vis_image)
+        Only the `max_matches` most confident matches are drawn, on a copy
+        downscaled by `scale`. The caller's list is not modified.
+        """
+        if screen is None:
+            screen = self.screen_image
+        elif isinstance(screen, FrameContext):
+            screen = screen.bgr()
+        if screen is None:
+            logging.warning("No screen image to visualize")
+            return False
+            
+        top = heapq.nlargest(max_matches, matches, key=lambda m: m.confidence)
+        markers = tuple(
+            MatchMarker(int(m.x), int(m.y), int(m.width), int(m.height),
+                        float(m.confidence), float(m.quality.structural_similarity))
+            for m in top
+        )
+        # Downscale here: the worker gets its own (smaller) image, since by the
+        # time it draws the caller may have reused the frame buffer
+        if scale != 1.0:
+            image = cv2.resize(screen, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            image = screen.copy()
+        return self.visualizer.submit(image, markers, output_path, scale)
 
     def extract_match_region(self, x: int, y: int, width: int, height: int) -> np.ndarray:
         """Extract the region of the screen image corresponding to a match."""
@@ -431,6 +719,10 @@ def test_matcher():
     target_path = os.path.join(image_dir, "target.png")
     field_images = [f for f in os.listdir(image_dir) if f.startswith("field") and f.endswith(".png")]
     
+    # Bundled field captures are Retina (2x) screenshots
+    if not matcher.load_target(target_path, scale=2.0):
+        return
+    
     total_start_time = time.time()
     match_results = []
     
@@ -439,24 +731,15 @@ def test_matcher():
         logging.info(f"\nProcessing {field_image}")
         
         try:
-            # Load images and find matches
-            matcher.load_images(field_path, target_path)
-            matches = matcher.find_matches()
-            
-            # Create annotated image with red dot
-            try:
-                matcher.create_annotated_image(matches, field_path)
-                logging.info(f"Successfully created annotated image for {field_image}")
-            except Exception as e:
-                logging.error(f"Error creating annotated image for {field_image}: {str(e)}")
-                import traceback
-                logging.error(traceback.format_exc())
+            # Load screen and find matches
+            screen = matcher.frame_context(Image.open(field_path).convert('RGB'))
+            matches = matcher.find_matches(screen, nms=True, min_confidence=matcher.threshold)
             
             # Save visualization
             try:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 output_path = os.path.join(matcher.debug_dir, f"matches_{field_image}_{timestamp}.png")
-                matcher.visualize_matches(matches, output_path)
+                matcher.visualize_matches(matches, output_path, screen=screen)
                 logging.info(f"Successfully created visualization for {field_image}")
             except Exception as e:
                 logging.error(f"Error creating visualization for {field_image}: {str(e)}")
@@ -490,6 +773,9 @@ def test_matcher():
             logging.error(traceback.format_exc())
             continue
     
+    # Wait for queued visualizations before exiting
+    matcher.visualizer.flush()
+    
     # Print summary
     total_time = time.time() - total_start_time
     logging.info("\n=== Summary ===")
@@ -8,6 +8,11 @@ import time
 from datetime import datetime
 import mss
 import argparse
+from match_tracker import SearchWindowTracker
+from template_registry import get_template
+from monitor_affinity import MonitorAffinity
+from click_executor import ClickExecutor
+from poll_scheduler import AdaptivePollScheduler
 
 # Set up logging
 logging.basicConfig(
@@ -15,52 +20,12 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
+CURSOR_HEADER_PATH = os.path.join("images", "cursor-screen-head.png")
+
 def find_cursor_monitor():
     """Find the monitor containing the Cursor application."""
     logging.info("Searching for monitor with Cursor application...")
-    
-    # Load reference image
-    ref_path = os.path.join("images", "cursor-screen-head.png")
-    reference_img = cv2.imread(ref_path)
-    if reference_img is None:
-        logging.error(f"Reference image not found at {ref_path}")
-        return None
-        
-    with mss.mss() as sct:
-        # Check each monitor
-        for i, monitor in enumerate(sct.monitors[1:], 1):
-            logging.info(f"Checking monitor {i}: {monitor['width']}x{monitor['height']} at ({monitor['left']}, {monitor['top']})")
-            
-            # Capture top portion of monitor
-            area = {
-                "left": monitor["left"],
-                "top": monitor["top"],
-                "width": monitor["width"],
-                "height": 50  # Only check top 50 pixels
-            }
-            
-            try:
-                # Capture and convert to numpy array
-                screenshot = sct.grab(area)
-                screen_img = np.array(screenshot)
-                screen_img = screen_img[:, :, :3]  # Remove alpha channel
-                
-                # Template matching
-                result = cv2.matchTemplate(screen_img, reference_img, cv2.TM_CCOEFF_NORMED)
-                min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-                
-                logging.info(f"Monitor {i} match confidence: {max_val:.3f}")
-                
-                if max_val > 0.8:  # High confidence threshold
-                    logging.info(f"Found Cursor application on monitor {i}")
-                    return monitor
-                    
-            except Exception as e:
-                logging.warning(f"Error checking monitor {i}: {str(e)}")
-                continue
-    
-    logging.warning("Could not find Cursor application, falling back to primary monitor")
-    return sct.monitors[1]
+    return MonitorAffinity(CURSOR_HEADER_PATH).search()
 
 class ClickBot:
     def __init__(self, dev_mode=False):
@@ -70,13 +35,11 @@ class ClickBot:
         
         # Load target image
         target_path = os.path.join("images", "target.png")
-        target = Image.open(target_path)
-        target = target.convert('RGB')
-        target_np = np.array(target)
-        self.target_bgr = cv2.cvtColor(target_np, cv2.COLOR_RGB2BGR)
+        self.target_bgr = get_template(target_path).bgr
         
-        # Find correct monitor
-        self.monitor = find_cursor_monitor()
+        # Find correct monitor, then keep verifying it by header fingerprint
+        self.monitor_affinity = MonitorAffinity(CURSOR_HEADER_PATH)
+        self.monitor = self.monitor_affinity.select()
         if not self.monitor:
             raise RuntimeError("Failed to find Cursor monitor")
             
@@ -88,19 +51,38 @@ class ClickBot:
         # Store target dimensions
         self.target_h, self.target_w = self.target_bgr.shape[:2]
         
+        self.last_frame = None
+        
+        # Mouse actions run on their own thread so detection never waits on them
+        self.clicker = ClickExecutor()
+        
+        # Search near the last hit first, full monitor only on miss
+        self.tracker = SearchWindowTracker(
+            self.target_bgr,
+            (self.monitor['width'], self.monitor['height']),
+            threshold=0.8
+        )
+        
+    def _grab_region(self, sct, region):
+        """Capture a monitor-relative (x, y, w, h) region as BGR."""
+        x, y, w, h = region
+        screenshot = sct.grab({
+            "left": self.monitor['left'] + x,
+            "top": self.monitor['top'] + y,
+            "width": w,
+            "height": h
+        })
+        self.last_frame = np.array(screenshot)[:, :, :3]  # Remove alpha channel
+        return self.last_frame
+        
     def check_for_target(self):
-        """Check for target in the current screen."""
+        """Check for target in the current screen; returns True if it was found."""
         with mss.mss() as sct:
-            # Capture screen
-            screenshot = sct.grab(self.monitor)
-            screen_np = np.array(screenshot)
-            screen_bgr = screen_np[:, :, :3]  # Remove alpha channel
+            # Capture and match, local window first
+            max_val, max_loc = self.tracker.locate(lambda region: self._grab_region(sct, region))
+            detected_at = time.time()
             
-            # Perform template matching
-            result = cv2.matchTemplate(screen_bgr, self.target_bgr, cv2.TM_CCOEFF_NORMED)
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            if max_val >= 0.8:  # High confidence match
+            if max_loc is not None:  # High confidence match
                 x, y = max_loc
                 click_x = self.monitor['left'] + x + self.target_w // 2
                 click_y = self.monitor['top'] + y + self.target_h // 2
@@ -110,46 +92,50 @@ class ClickBot:
                 if self.dev_mode:
                     response = input("Click target? [y/N] ")
                     if response.lower() != 'y':
-                        return
-                
-                # Save current mouse position
-                original_x, original_y = pyautogui.position()
+                        return True
                 
-                try:
-                    # Move to target and click
-                    pyautogui.moveTo(click_x, click_y, duration=0.2)
-                    time.sleep(0.1)
-                    pyautogui.click()
-                    time.sleep(0.1)
-                    
-                    # Return to original position
-                    pyautogui.moveTo(original_x, original_y, duration=0.1)
-                    logging.info("Click executed successfully")
-                    
-                except Exception as e:
-                    logging.error(f"Error during click operation: {str(e)}")
+                # Move, click and return to the original position off-thread
+                if self.clicker.click(click_x, click_y, detected_at=detected_at):
+                    logging.info("Click queued")
+                return True
             
-            else:
-                logging.debug(f"No high confidence matches found (best: {max_val:.2%})")
+            logging.debug(f"No high confidence matches found (best: {max_val:.2%})")
+            return False
     
-    def run(self, check_interval=1.0):
-        """Run the click bot continuously."""
+    def run(self, check_interval=1.0, min_interval=0.05):
+        """Run the click bot continuously.
+        
+        Polls every `min_interval` seconds while the screen is active and backs
+        off to `check_interval` while it is static.
+        """
         logging.info("Starting click bot...")
-        last_monitor_check = time.time()
+        last_stats_log = time.time()
+        scheduler = AdaptivePollScheduler(floor_interval=min_interval, ceiling_interval=check_interval)
         
         try:
             while True:
-                # Check if we need to update monitor selection (every 5 minutes)
+                # Cheap fingerprint check; full multi-monitor search only on divergence
+                monitor = self.monitor_affinity.select()
+                if monitor != self.monitor:
+                    self.monitor = monitor
+                    self.tracker.reset((monitor['width'], monitor['height']))
+                
                 current_time = time.time()
-                if current_time - last_monitor_check >= 300:  # 5 minutes
-                    self.monitor = find_cursor_monitor()
-                    last_monitor_check = current_time
+                if current_time - last_stats_log >= 300:  # 5 minutes
+                    logging.info(f"Search tracker stats: {self.tracker.stats.summary()}")
+                    logging.info(f"Click latency: {self.clicker.latency_summary()}")
+                    logging.info(f"Poll rate: {scheduler.rate:.1f}Hz ({scheduler.polls} polls, {scheduler.changes} changed)")
+                    logging.info(f"Monitor checks: {self.monitor_affinity.verifications} verified, "
+                                 f"{self.monitor_affinity.full_searches} full searches")
+                    last_stats_log = current_time
                 
-                self.check_for_target()
-                time.sleep(check_interval)
+                found = self.check_for_target()
+                scheduler.observe(self.last_frame, accept_seen=found)
+                scheduler.sleep()
                 
         except KeyboardInterrupt:
             logging.info("Click bot stopped by user")
+            self.clicker.stop()
         except Exception as e:
             logging.error(f"Click bot error: {str(e)}")
 
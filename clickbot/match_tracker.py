@@ -0,0 +1,121 @@
+import cv2
+import numpy as np
+import logging
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+# (x, y, width, height) relative to the monitor being watched
+Region = Tuple[int, int, int, int]
+
+@dataclass
+class TrackerStats:
+    """Hit counters for the local (windowed) and full-monitor searches."""
+    local_attempts: int = 0
+    local_hits: int = 0
+    full_searches: int = 0
+    full_hits: int = 0
+
+    @property
+    def local_hit_rate(self) -> float:
+        """Fraction of local searches that found the target."""
+        if not self.local_attempts:
+            return 0.0
+        return self.local_hits / self.local_attempts
+
+    def summary(self) -> str:
+        return (f"local {self.local_hits}/{self.local_attempts} "
+                f"({self.local_hit_rate:.1%}), full {self.full_hits}/{self.full_searches}")
+
+class SearchWindowTracker:
+    """Match a template near its last confirmed location before searching the whole monitor.
+
+    The window around the last hit is `window_scale` times the template size,
+    so steady-state cost scales with the template rather than the screen. A
+    full-monitor search runs on a local miss, when nothing has been found yet,
+    or once every `full_search_interval` seconds to catch a moved target.
+    After `max_misses` consecutive full-search misses the last hit is
+    forgotten, so an idle screen costs one full search per poll, not two.
+    """
+
+    def __init__(self, template: np.ndarray, frame_size: Tuple[int, int], threshold: float = 0.8,
+                 window_scale: float = 3.0, full_search_interval: float = 30.0,
+                 method: int = cv2.TM_CCOEFF_NORMED, max_misses: int = 3):
+        self.template = template
+        self.template_h, self.template_w = template.shape[:2]
+        self.threshold = threshold
+        self.window_scale = window_scale
+        self.full_search_interval = full_search_interval
+        self.method = method
+        self.max_misses = max_misses
+        self.stats = TrackerStats()
+        self.frame_w, self.frame_h = frame_size
+        self.last_location: Optional[Tuple[int, int]] = None  # Top-left of last hit
+        self.last_full_search = 0.0
+        self.misses = 0  # Consecutive full-search misses since the last hit
+
+    def reset(self, frame_size: Optional[Tuple[int, int]] = None):
+        """Forget the last hit, e.g. after switching monitors."""
+        if frame_size is not None:
+            self.frame_w, self.frame_h = frame_size
+        self.last_location = None
+        self.last_full_search = 0.0
+        self.misses = 0
+
+    def local_window(self) -> Optional[Region]:
+        """Region around the last hit, or None when a full search is due."""
+        if self.last_location is None:
+            return None
+        if time.time() - self.last_full_search >= self.full_search_interval:
+            return None
+
+        win_w = min(self.frame_w, int(self.template_w * self.window_scale))
+        win_h = min(self.frame_h, int(self.template_h * self.window_scale))
+        center_x = self.last_location[0] + self.template_w // 2
+        center_y = self.last_location[1] + self.template_h // 2
+
+        # Clamp to the frame so the window keeps its full size at the edges
+        x = min(max(0, center_x - win_w // 2), self.frame_w - win_w)
+        y = min(max(0, center_y - win_h // 2), self.frame_h - win_h)
+        return x, y, win_w, win_h
+
+    def _match(self, image: np.ndarray) -> Tuple[float, Tuple[int, int]]:
+        if image.shape[0] < self.template_h or image.shape[1] < self.template_w:
+            return 0.0, (0, 0)
+        result = cv2.matchTemplate(image, self.template, self.method)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return max_val, max_loc
+
+    def locate(self, grab: Callable[[Region], np.ndarray]) -> Tuple[float, Optional[Tuple[int, int]]]:
+        """Find the template, returning (confidence, top-left) or (best confidence, None).
+
+        `grab` captures a monitor-relative region and returns it as an image in
+        the same color space as the template.
+        """
+        window = self.local_window()
+        if window is not None:
+            self.stats.local_attempts += 1
+            x, y = window[:2]
+            confidence, loc = self._match(grab(window))
+            if confidence >= self.threshold:
+                self.stats.local_hits += 1
+                self.misses = 0
+                self.last_location = (x + loc[0], y + loc[1])
+                return confidence, self.last_location
+            logging.debug(f"Local search missed (best: {confidence:.2%}), falling back to full search")
+
+        self.stats.full_searches += 1
+        self.last_full_search = time.time()
+        confidence, loc = self._match(grab((0, 0, self.frame_w, self.frame_h)))
+        if confidence >= self.threshold:
+            self.stats.full_hits += 1
+            self.misses = 0
+            self.last_location = loc
+            return confidence, loc
+
+        # Keep the previous anchor for a few polls: the button usually
+        # reappears where it was, but once it is gone the local probe is waste
+        self.misses += 1
+        if self.misses >= self.max_misses:
+            self.last_location = None
+        return confidence, None
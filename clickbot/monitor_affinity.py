@@ -0,0 +1,111 @@
+import cv2
+import numpy as np
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import mss
+
+from template_registry import get_template
+
+class MonitorAffinity:
+    """Remember which monitor shows Cursor and re-verify it cheaply each tick.
+
+    The full search grabs the header strip of every monitor in parallel and
+    template-matches it against the reference. Once a monitor wins, only the
+    reference-sized patch where it matched is re-grabbed and reduced to a tiny
+    grayscale fingerprint; the full search reruns only when that diverges.
+    If no monitor matched, the search is retried every `retry_interval` seconds.
+    """
+
+    def __init__(self, reference_path: str, threshold: float = 0.8, strip_height: int = 50,
+                 fingerprint_size: Tuple[int, int] = (16, 4), tolerance: float = 12.0,
+                 retry_interval: float = 300.0):
+        self.reference = get_template(reference_path).bgr
+        self.threshold = threshold
+        self.strip_height = strip_height
+        self.fingerprint_size = fingerprint_size
+        self.tolerance = tolerance  # Max mean absolute difference between fingerprints
+        self.retry_interval = retry_interval
+        self.last_search = 0.0
+        self.monitor: Optional[Dict] = None
+        self._patch: Optional[Dict] = None  # Absolute region of the matched header patch
+        self._fingerprint: Optional[np.ndarray] = None
+        self.full_searches = 0
+        self.verifications = 0
+
+    def _reduce(self, img: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
+        return cv2.resize(gray, self.fingerprint_size, interpolation=cv2.INTER_AREA).astype(np.float32)
+
+    def _probe(self, monitor: Dict) -> Tuple[float, Tuple[int, int]]:
+        """Match the reference in one monitor's header strip; runs on a worker thread."""
+        area = {
+            "left": monitor["left"],
+            "top": monitor["top"],
+            "width": monitor["width"],
+            "height": self.strip_height
+        }
+        # mss handles are not shareable across threads
+        with mss.mss() as sct:
+            screen_img = np.array(sct.grab(area))[:, :, :3]  # Remove alpha channel
+        result = cv2.matchTemplate(screen_img, self.reference, cv2.TM_CCOEFF_NORMED)
+        _, max_val, _, max_loc = cv2.minMaxLoc(result)
+        return max_val, max_loc
+
+    def search(self) -> Optional[Dict]:
+        """Probe every monitor in parallel and remember the best match above threshold."""
+        self.full_searches += 1
+        self.last_search = time.time()
+        with mss.mss() as sct:
+            monitors: List[Dict] = [dict(m) for m in sct.monitors[1:]]
+        if not monitors:
+            return None
+
+        with ThreadPoolExecutor(max_workers=len(monitors)) as pool:
+            futures = [pool.submit(self._probe, monitor) for monitor in monitors]
+            results = []
+            for i, future in enumerate(futures, 1):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logging.warning(f"Error checking monitor {i}: {str(e)}")
+                    results.append((0.0, (0, 0)))
+                logging.info(f"Monitor {i} match confidence: {results[-1][0]:.3f}")
+
+        best = max(range(len(monitors)), key=lambda i: results[i][0])
+        confidence, (x, y) = results[best]
+        if confidence <= self.threshold:
+            logging.warning("Could not find Cursor application, falling back to primary monitor")
+            self.monitor, self._patch, self._fingerprint = monitors[0], None, None
+            return self.monitor
+
+        monitor = monitors[best]
+        ref_h, ref_w = self.reference.shape[:2]
+        self._patch = {"left": monitor["left"] + x, "top": monitor["top"] + y, "width": ref_w, "height": ref_h}
+        with mss.mss() as sct:
+            self._fingerprint = self._reduce(np.array(sct.grab(self._patch)))
+        self.monitor = monitor
+        logging.info(f"Found Cursor application on monitor {best + 1}")
+        return monitor
+
+    def verify(self) -> bool:
+        """Check that the header patch on the remembered monitor still looks the same."""
+        if self._patch is None:
+            return False
+        self.verifications += 1
+        with mss.mss() as sct:
+            fingerprint = self._reduce(np.array(sct.grab(self._patch)))
+        return float(np.mean(np.abs(fingerprint - self._fingerprint))) <= self.tolerance
+
+    def select(self) -> Optional[Dict]:
+        """Return the Cursor monitor, re-running the full search only if verification fails."""
+        if self.monitor is not None and self._patch is None:
+            # Fallback monitor: nothing to verify, so only retry periodically
+            if time.time() - self.last_search < self.retry_interval:
+                return self.monitor
+        elif self.monitor is not None:
+            if self.verify():
+                return self.monitor
+            logging.info("Monitor header fingerprint changed, searching all monitors")
+        return self.search()
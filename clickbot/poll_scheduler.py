@@ -0,0 +1,187 @@
+"""
+Adaptive polling for the detection loops.
+
+Polls at the floor rate while the screen is changing or an Accept button was
+seen recently, and backs off exponentially towards the ceiling while the
+screen is static. ReplaySource plays back recorded frames on a virtual clock
+so the CPU vs detection-latency trade-off can be measured offline:
+
+    python poll_scheduler.py replay.json --floor 0.05 --ceiling 1.0
+"""
+import argparse
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+class AdaptivePollScheduler:
+    """Chooses the sleep between polls from recent screen activity."""
+
+    def __init__(self, floor_interval: float = 0.05, ceiling_interval: float = 1.0, backoff: float = 1.5,
+                 hot_window: float = 5.0, change_threshold: float = 2.0, sample_width: int = 64,
+                 clock: Callable[[], float] = time.monotonic):
+        if floor_interval <= 0 or ceiling_interval < floor_interval:
+            raise ValueError("Need 0 < floor_interval <= ceiling_interval")
+        self.floor_interval = floor_interval
+        self.ceiling_interval = ceiling_interval
+        self.backoff = backoff
+        self.hot_window = hot_window              # Seconds to stay at the floor after activity
+        self.change_threshold = change_threshold  # Mean abs difference of sampled pixels
+        self.sample_width = sample_width
+        self.clock = clock
+        self.interval = floor_interval
+        self.last_activity = None
+        self._last_sample = None
+        self.polls = 0
+        self.changes = 0
+
+    @property
+    def rate(self) -> float:
+        """Current polling rate in Hz."""
+        return 1.0 / self.interval
+
+    def frame_changed(self, frame) -> bool:
+        """Compare a strided sample of the frame with the previous one."""
+        frame = np.asarray(frame)
+        step = max(1, frame.shape[1] // self.sample_width)
+        sample = frame[::step, ::step].astype(np.int16)
+        previous, self._last_sample = self._last_sample, sample
+        if previous is None or previous.shape != sample.shape:
+            # New baseline (first frame or a different capture region)
+            return False
+        return float(np.mean(np.abs(sample - previous))) > self.change_threshold
+
+    def observe(self, frame=None, changed: Optional[bool] = None, accept_seen: bool = False) -> float:
+        """Record one poll and return the interval to wait before the next.
+
+        Pass either the captured `frame` or a precomputed `changed` flag.
+        """
+        self.polls += 1
+        if changed is None:
+            changed = frame is not None and self.frame_changed(frame)
+        now = self.clock()
+        if changed:
+            self.changes += 1
+        if changed or accept_seen:
+            self.last_activity = now
+
+        if self.last_activity is not None and now - self.last_activity < self.hot_window:
+            self.interval = self.floor_interval
+        else:
+            self.interval = min(self.ceiling_interval, self.interval * self.backoff)
+        return self.interval
+
+    def sleep(self):
+        time.sleep(self.interval)
+
+    def stats(self) -> Dict[str, float]:
+        return {"rate_hz": self.rate, "interval": self.interval, "polls": self.polls, "changes": self.changes}
+
+@dataclass
+class ReplayFrame:
+    t: float            # Seconds from the start of the recording
+    image: str          # Path to the captured frame
+    accept: bool = False
+
+class ReplaySource:
+    """Recorded frames, each shown from its timestamp until the next one.
+
+    Manifest format: {"frames": [{"t": 0.0, "image": "frame_000.png", "accept": false}, ...]}
+    with image paths relative to the manifest.
+    """
+
+    def __init__(self, frames: List[ReplayFrame]):
+        self.frames = sorted(frames, key=lambda f: f.t)
+        self._images: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_manifest(cls, path: str) -> "ReplaySource":
+        with open(path, 'r') as f:
+            manifest = json.load(f)
+        base = os.path.dirname(os.path.abspath(path))
+        frames = [ReplayFrame(f["t"], os.path.join(base, f["image"]), f.get("accept", False))
+                  for f in manifest.get("frames", [])]
+        if not frames:
+            raise ValueError(f"Replay manifest {path} has no frames")
+        for frame in frames:
+            if not os.path.isfile(frame.image):
+                raise ValueError(f"Replay frame image not found: {frame.image}")
+        return cls(frames)
+
+    @property
+    def duration(self) -> float:
+        return self.frames[-1].t if self.frames else 0.0
+
+    def frame_at(self, t: float) -> ReplayFrame:
+        current = self.frames[0]
+        for frame in self.frames:
+            if frame.t > t:
+                break
+            current = frame
+        return current
+
+    def image(self, frame: ReplayFrame) -> np.ndarray:
+        if frame.image not in self._images:
+            import cv2
+            image = cv2.imread(frame.image)
+            if image is None:
+                raise ValueError(f"Could not read replay frame image: {frame.image}")
+            self._images[frame.image] = image
+        return self._images[frame.image]
+
+def measure_tradeoff(source: ReplaySource, floor_interval: float, ceiling_interval: float, **kwargs) -> Dict:
+    """Replay a recording on a virtual clock; returns poll count and Accept detection latency."""
+    now = [0.0]
+    scheduler = AdaptivePollScheduler(floor_interval, ceiling_interval, clock=lambda: now[0], **kwargs)
+
+    # Each run of consecutive accept frames is one episode to detect
+    episodes = []
+    for i, frame in enumerate(source.frames):
+        if frame.accept and (i == 0 or not source.frames[i - 1].accept):
+            episodes.append(frame.t)
+    latencies = {}
+
+    while now[0] <= source.duration:
+        frame = source.frame_at(now[0])
+        scheduler.observe(source.image(frame), accept_seen=frame.accept)
+        if frame.accept:
+            start = max(t for t in episodes if t <= now[0])
+            latencies.setdefault(start, now[0] - start)
+        now[0] += scheduler.interval
+
+    detected = list(latencies.values())
+    return {
+        "floor_interval": floor_interval,
+        "ceiling_interval": ceiling_interval,
+        "polls": scheduler.polls,
+        "polls_per_second": scheduler.polls / source.duration if source.duration else 0.0,
+        "episodes": len(episodes),
+        "missed": len(episodes) - len(detected),
+        "mean_latency": float(np.mean(detected)) if detected else None,
+        "max_latency": float(np.max(detected)) if detected else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure polling cost vs detection latency on a replay")
+    parser.add_argument("manifest", help="Replay manifest JSON")
+    parser.add_argument("--floor", type=float, default=0.05, help="Fastest poll interval (seconds)")
+    parser.add_argument("--ceiling", type=float, default=1.0, help="Slowest poll interval (seconds)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    try:
+        source = ReplaySource.from_manifest(args.manifest)
+    except ValueError as e:
+        parser.error(str(e))
+    for name, floor, ceiling in [("adaptive", args.floor, args.ceiling),
+                                 ("fixed-floor", args.floor, args.floor),
+                                 ("fixed-ceiling", args.ceiling, args.ceiling)]:
+        result = measure_tradeoff(source, floor, ceiling)
+        logging.info(f"{name}: {json.dumps(result)}")
+
+if __name__ == "__main__":
+    main()
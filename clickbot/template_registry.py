@@ -0,0 +1,107 @@
+import cv2
+import numpy as np
+import os
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from PIL import Image
+
+# Pyramid levels stop once the template would shrink below this size
+MIN_PYRAMID_SIZE = 4
+MAX_PYRAMID_LEVELS = 3
+
+@dataclass(frozen=True)
+class TemplateAsset:
+    """A template image with every variant the matchers need, computed once at load.
+
+    Arrays are marked read-only because assets are shared process-wide.
+    """
+    path: str
+    mtime: float
+    scale: float
+    rgb: np.ndarray
+    bgr: np.ndarray
+    gray: np.ndarray
+    edges: np.ndarray           # Canny(50, 150) as a 0/1 float32 mask
+    gray_mean: float            # Mean/std of the gray template for normalized correlation
+    gray_std: float
+    pyramids: Dict[str, Tuple[np.ndarray, ...]] = field(default_factory=dict)  # domain -> levels, level 0 first
+
+    @property
+    def width(self) -> int:
+        return self.bgr.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.bgr.shape[0]
+
+def _build_pyramid(image: np.ndarray) -> Tuple[np.ndarray, ...]:
+    levels: List[np.ndarray] = [image]
+    while len(levels) <= MAX_PYRAMID_LEVELS:
+        h, w = levels[-1].shape[:2]
+        if min(h, w) // 2 < MIN_PYRAMID_SIZE:
+            break
+        levels.append(cv2.pyrDown(levels[-1]))
+    for level in levels:
+        level.setflags(write=False)
+    return tuple(levels)
+
+def _load_asset(path: str, mtime: float, scale: float) -> TemplateAsset:
+    # Load with PIL to match the raw screenshot format, as ImageMatcher always has
+    rgb = np.array(Image.open(path).convert('RGB'))
+    if scale != 1.0:
+        rgb = cv2.resize(rgb, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    bgr = cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR)
+    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    edges = (cv2.Canny(gray, 50, 150) > 0).astype(np.float32)
+    mean, std = cv2.meanStdDev(gray)
+
+    for image in (rgb, bgr, gray, edges):
+        image.setflags(write=False)
+
+    return TemplateAsset(
+        path=path,
+        mtime=mtime,
+        scale=scale,
+        rgb=rgb,
+        bgr=bgr,
+        gray=gray,
+        edges=edges,
+        gray_mean=float(mean[0][0]),
+        gray_std=float(std[0][0]),
+        pyramids={"bgr": _build_pyramid(bgr), "gray": _build_pyramid(gray), "edge": _build_pyramid(edges)},
+    )
+
+class TemplateRegistry:
+    """Process-wide cache of template assets keyed by path, mtime and scale.
+
+    Editing a template on disk changes its mtime, so the next lookup reloads it.
+    """
+
+    def __init__(self):
+        self._assets: Dict[Tuple[str, float], TemplateAsset] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, scale: float = 1.0) -> TemplateAsset:
+        """Get the asset for an image file, loading it on first use or after it changes."""
+        path = os.path.abspath(path)
+        mtime = os.path.getmtime(path)  # Raises FileNotFoundError for missing templates
+        key = (path, scale)
+        with self._lock:
+            asset = self._assets.get(key)
+            if asset is None or asset.mtime != mtime:
+                asset = _load_asset(path, mtime, scale)
+                self._assets[key] = asset
+                logging.info(f"Loaded template {path} at scale {scale}: {asset.width}x{asset.height}")
+            return asset
+
+    def clear(self):
+        with self._lock:
+            self._assets.clear()
+
+_registry = TemplateRegistry()
+
+def get_template(path: str, scale: float = 1.0) -> TemplateAsset:
+    """Get a template asset from the shared registry."""
+    return _registry.get(path, scale)
@@ -1,12 +1,14 @@
 #!/usr/bin/env python3
 import sys
-import json
 import time
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPainter, QPen, QColor
 from Quartz import NSEvent, NSSystemDefined
 
+import repo_root  # Shared helpers live at the repository root
+from config_service import write_config
+
 def get_cursor_position():
     pos = NSEvent.mouseLocation()
     return {'x': int(pos.x), 'y': int(NSEvent.mouseLocation().y)}
@@ -91,8 +93,8 @@ class ClickBotCalibrator:
             self.coord_label.close()
         
     def save_config(self):
-        with open('clickbot_v2/config.json', 'w') as f:
-            json.dump(self.config, f, indent=4)
+        # Atomic replace, so running watchers never read a half-written file
+        write_config('clickbot_v2/config.json', self.config)
         print("\n💾 Configuration saved to clickbot_v2/config.json")
         
     def run_calibration(self):
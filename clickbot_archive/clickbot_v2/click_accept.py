@@ -1,18 +1,25 @@
 #!/usr/bin/env python3
-import json
 import sys
 import os
 import time
 import mss
 import numpy as np
+import cv2
 from PIL import Image
 import pytesseract
 from PyQt5.QtWidgets import QApplication
 import pyautogui
 
+import repo_root  # Shared helpers live at the repository root
+from clickbot.poll_scheduler import AdaptivePollScheduler
+from polarity_masks import PolarityMasks
+from config_service import ConfigService, require_keys
+
 class AcceptButtonWatcher:
     def __init__(self):
         self.sct = mss.mss()
+        # Light text (>= 215) masks, built into reused buffers
+        self.polarity = PolarityMasks(light_level=215)
         # Find the monitor with the Cursor menu bar
         self.monitor = None
         for mon in self.sct.monitors[1:]:  # Skip the "all monitors" monitor
@@ -23,10 +30,23 @@ class AcceptButtonWatcher:
             self.monitor = self.sct.monitors[1]  # Fallback to primary
             
         self.config_file = 'clickbot_v2/config.json'
+        # Loaded once and reloaded in the background when recalibration rewrites the file
+        self.config_service = ConfigService(self.config_file, require_keys(
+            'accept_button.x', 'accept_button.y',
+            'button_area.x', 'button_area.y', 'button_area.width', 'button_area.height'))
+        self.config_service.subscribe(self.on_config_change)
         self.app = QApplication.instance() or QApplication(sys.argv)
         self.last_status_time = 0
         self.status_interval = 5
         
+        # Change-triggered OCR: the last OCR'd text mask and what it read
+        self.last_mask = None
+        self.last_text = ''
+        self.caret_width = 4          # Diffs no wider than this are a blinking caret
+        self.min_changed_pixels = 20  # Fewer changed mask pixels than this is noise
+        self.ocr_runs = 0
+        self.ocr_skips = 0
+        
     def check_for_cursor_menu(self, monitor):
         """Check if this monitor contains the Cursor menu."""
         # Capture top-left area where Cursor menu should be
@@ -40,10 +60,7 @@ class AcceptButtonWatcher:
         img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
         
         # Process for text detection
-        img_array = np.array(img)
-        text_mask = np.all((img_array >= [215, 215, 215]), axis=2)
-        result = np.zeros_like(img_array)
-        result[text_mask] = [255, 255, 255]
+        result = self.polarity.light(np.asarray(img))
         result_pil = Image.fromarray(result)
         result_pil = result_pil.resize((result_pil.width * 2, result_pil.height * 2))
         
@@ -100,29 +117,24 @@ class AcceptButtonWatcher:
         print(f"\n📏 Scanning area: {config['button_area']['width']}x{config['button_area']['height']} pixels")
         print(f"   centered at ({rel_x}, {rel_y}) relative to monitor at ({self.monitor['left']}, {self.monitor['top']})")
         
-        os.makedirs('clickbot_v2', exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=4)
+        self.config_service.save(config)
         print("\n💾 Configuration saved!")
         return config
         
-    def preprocess_image(self, screenshot):
-        """Preprocess the image for better OCR results."""
-        # Convert to PIL Image
-        img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
+    def text_mask(self, screenshot):
+        """White text on black background where every channel is light.
         
-        # Convert to numpy array for processing
-        img_array = np.array(img)
+        Returns the polarity buffer, which the next call overwrites.
+        """
+        return self.polarity.light(np.asarray(screenshot))
         
-        # Create mask for light text on dark background (inverted)
-        text_mask = np.all((img_array >= [215, 215, 215]), axis=2)  # Looking for light text
-        
-        # Create white text on black background
-        result = np.zeros_like(img_array)
-        result[text_mask] = [255, 255, 255]
+    def preprocess_image(self, screenshot, mask=None):
+        """Preprocess the image for better OCR results."""
+        if mask is None:
+            mask = self.text_mask(screenshot)
         
         # Scale up for better OCR
-        result_pil = Image.fromarray(result)
+        result_pil = Image.fromarray(mask)
         result_pil = result_pil.resize((result_pil.width * 2, result_pil.height * 2))
         
         # Save debug image with timestamp
@@ -131,10 +143,10 @@ class AcceptButtonWatcher:
         print(f"💾 Saved debug image: {debug_path}")
         return result_pil
         
-    def read_text(self, screenshot):
+    def read_text(self, screenshot, mask=None):
         """Use OCR to read text from the screenshot."""
         # Preprocess the image
-        processed_img = self.preprocess_image(screenshot)
+        processed_img = self.preprocess_image(screenshot, mask)
         
         # Use Tesseract with specific config for better results
         custom_config = '--psm 7'  # Single line mode
@@ -147,6 +159,30 @@ class AcceptButtonWatcher:
             print("📝 No text detected in this frame")
         return text
         
+    def has_meaningful_change(self, mask):
+        """Whether the text mask differs from the last OCR'd one by more than a caret blink or noise."""
+        if self.last_mask is None or self.last_mask.shape != mask.shape:
+            return True
+        diff = cv2.bitwise_xor(mask, self.last_mask)
+        changed = cv2.countNonZero(diff)
+        if changed < self.min_changed_pixels:
+            return False
+        _, _, width, _ = cv2.boundingRect(diff)
+        return width > self.caret_width
+        
+    def check_text(self, screenshot):
+        """Text in the button area, re-read by OCR only when the area meaningfully changed."""
+        mask = self.text_mask(screenshot)
+        if not self.has_meaningful_change(mask):
+            self.ocr_skips += 1
+            return self.last_text
+        
+        text = self.read_text(screenshot, mask)
+        self.last_mask = mask.copy()  # The polarity buffer is reused next frame
+        self.last_text = text
+        self.ocr_runs += 1
+        return text
+        
     def is_accept_button(self, screenshot, text):
         """Check if the text contains 'accept' or '⌘'."""
         has_accept = 'accept' in text or '⌘' in text
@@ -159,6 +195,9 @@ class AcceptButtonWatcher:
         current_time = time.time()
         if force or (current_time - self.last_status_time) >= self.status_interval:
             print("👀 Watching for Accept/⌘ buttons... (Press Ctrl+C to stop)")
+            frames = self.ocr_runs + self.ocr_skips
+            if frames:
+                print(f"📊 OCR ran on {self.ocr_runs}/{frames} frames, skipped {self.ocr_skips / frames:.0%} unchanged")
             self.last_status_time = current_time
         
     def click_position(self, rel_x, rel_y):
@@ -168,25 +207,33 @@ class AcceptButtonWatcher:
         pyautogui.click(abs_x, abs_y)
         print(f"🖱️  Clicked at ({abs_x}, {abs_y})")
         
+    def on_config_change(self, old, new):
+        """A recalibrated button area invalidates the cached OCR verdict."""
+        if old is not None:
+            print("🔄 Configuration reloaded")
+            self.last_mask = None
+        
     def watch_and_click(self):
         try:
             # Load or create configuration
-            try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-            except FileNotFoundError:
+            self.config_service.start()
+            if self.config_service.config is None:
                 print("⚙️  No configuration found. Starting calibration...")
-                config = self.calibrate()
+                self.calibrate()
             
             print("\n👀 Starting button watch...")
             print("Will click when 'Accept' or '⌘' is detected")
             print("Press Ctrl+C to stop")
             
-            button_area = config['button_area']
-            accept_pos = config['accept_button']
             checks = 0
+            scheduler = AdaptivePollScheduler(floor_interval=0.05, ceiling_interval=1.0)
             
             while True:
+                # In-memory copy; the service swaps in a new one when the file changes
+                config = self.config_service.config
+                button_area = config['button_area']
+                accept_pos = config['accept_button']
+                
                 # Capture the button area (using monitor-relative coordinates)
                 screenshot = self.sct.grab({
                     'left': self.monitor["left"] + button_area['x'],
@@ -195,18 +242,22 @@ class AcceptButtonWatcher:
                     'height': button_area['height']
                 })
                 
-                # Read and check text
-                text = self.read_text(screenshot)
-                if self.is_accept_button(screenshot, text):
+                # Read and check text (OCR only runs when the area changed)
+                text = self.check_text(screenshot)
+                accept_seen = self.is_accept_button(screenshot, text)
+                if accept_seen:
                     print(f"🎯 Found accept button! Text: '{text}'")
                     self.click_position(accept_pos['x'], accept_pos['y'])
+                    self.last_mask = None  # Re-read after clicking rather than trust the old verdict
                     time.sleep(0.5)  # Wait before checking again
                 
                 checks += 1
                 if checks % 10 == 0:  # Print status every 10 checks
                     self.print_status()
                     
-                time.sleep(0.2)  # Check every 200ms
+                # Poll faster while the button area is changing
+                scheduler.observe(screenshot, accept_seen=accept_seen)
+                scheduler.sleep()
                 
         except KeyboardInterrupt:
             print("\n👋 Stopped watching")
@@ -214,6 +265,8 @@ class AcceptButtonWatcher:
         except Exception as e:
             print(f"❌ Error: {str(e)}")
             return 1
+        finally:
+            self.config_service.stop()
 
 def main():
     watcher = AcceptButtonWatcher()
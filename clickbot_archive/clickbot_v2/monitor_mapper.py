@@ -2,7 +2,7 @@
 import mss
 import numpy as np
 from PIL import Image
-import pytesseract
+import cv2
 import pyautogui
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel
 from PyQt5.QtCore import Qt, QTimer
@@ -10,6 +10,11 @@ from PyQt5.QtGui import QPainter, QColor
 import sys
 import time
 
+import repo_root  # Shared helpers live at the repository root
+from ocr_atlas import batch_ocr
+from polarity_masks import PolarityMasks
+from theme_probe import ThemeProbe
+
 class CursorTracer(QWidget):
     def __init__(self):
         super().__init__()
@@ -36,6 +41,10 @@ class MonitorMapper:
         self.sct = mss.mss()
         self.app = QApplication.instance() or QApplication(sys.argv)
         self.tracer = None
+        # Light (>= 215) and dark (<= 40) menu text masks, built into reused buffers
+        self.polarity = PolarityMasks(light_level=215, dark_level=40)
+        # Menu bar theme per monitor, so only the matching text polarity is read
+        self.theme_probe = ThemeProbe()
         
     def find_menu_text(self, monitor, save_debug=False):
         """Try to find menu text in the top-left corner of a monitor."""
@@ -55,56 +64,23 @@ class MonitorMapper:
             print(f"💾 Saved original: {debug_path}")
         
         # Process for text detection
-        img_array = np.array(img)
-        
-        # Try both light text on dark and dark text on light
-        results = []
+        img_array = np.asarray(img)
         
-        # Light text on dark background
-        text_mask = np.all((img_array >= [215, 215, 215]), axis=2)
-        result = np.zeros_like(img_array)
-        result[text_mask] = [255, 255, 255]
+        # Light text on a dark menu bar, dark text on a light one (both if unsure)
+        polarities = self.theme_probe.text_polarities((monitor["left"], monitor["top"]), img_array)
+        masks = self.polarity.select(img_array, polarities)
         
         if save_debug:
-            debug_path = f'monitor_{monitor["left"]}_{monitor["top"]}_light.png'
-            Image.fromarray(result).save(debug_path)
-            print(f"💾 Saved light text: {debug_path}")
-        
-        # Scale up for better OCR
-        result_pil = Image.fromarray(result)
-        result_pil = result_pil.resize((result_pil.width * 2, result_pil.height * 2))
-        
-        # Try different PSM modes
-        for psm in [7, 6]:  # Line and uniform block modes
-            text = pytesseract.image_to_string(
-                result_pil,
-                config=f'--psm {psm}'
-            ).strip().lower()
-            if text:
-                results.append(text)
-        
-        # Dark text on light background
-        text_mask = np.all((img_array <= [40, 40, 40]), axis=2)
-        result = np.zeros_like(img_array)
-        result[text_mask] = [255, 255, 255]
-        
-        if save_debug:
-            debug_path = f'monitor_{monitor["left"]}_{monitor["top"]}_dark.png'
-            Image.fromarray(result).save(debug_path)
-            print(f"💾 Saved dark text: {debug_path}")
-        
-        # Scale up for better OCR
-        result_pil = Image.fromarray(result)
-        result_pil = result_pil.resize((result_pil.width * 2, result_pil.height * 2))
-        
-        # Try different PSM modes
-        for psm in [7, 6]:  # Line and uniform block modes
-            text = pytesseract.image_to_string(
-                result_pil,
-                config=f'--psm {psm}'
-            ).strip().lower()
-            if text:
-                results.append(text)
+            for polarity, mask in masks:
+                debug_path = f'monitor_{monitor["left"]}_{monitor["top"]}_{polarity}.png'
+                Image.fromarray(mask).save(debug_path)
+                print(f"💾 Saved {polarity} text: {debug_path}")
+        
+        # Scale up for better OCR and read every strip in one pass; the atlas
+        # stacks the strips as separate lines of a uniform block (--psm 6)
+        strips = [cv2.resize(mask, (mask.shape[1] * 2, mask.shape[0] * 2)) for _, mask in masks]
+        results = [text.strip().lower() for text in batch_ocr(strips, config='--psm 6')]
+        results = [text for text in results if text]
         
         return results
     
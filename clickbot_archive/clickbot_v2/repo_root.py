@@ -0,0 +1,8 @@
+"""
+Put the repository root on sys.path so this archived bot can import the
+shared helpers that live there. Import it before any of those helpers.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
@@ -5,10 +5,16 @@ import pyautogui
 import time
 from datetime import datetime
 
+import repo_root  # Shared helpers live at the repository root
+from frame_capture import Frame
+from pink_line import PinkLineDetector, PINK_EXACT
+
 class CursorFinder:
     def __init__(self):
         self.sct = mss.mss()
         self.cursor_monitor = None
+        # Lines at least 10px wide and at most 2px tall (bbox extents 11 and 3)
+        self.pink_detector = PinkLineDetector(PINK_EXACT, min_width=11, max_height=3)
         # Speed up mouse movement
         pyautogui.MINIMUM_DURATION = 0
         pyautogui.MINIMUM_SLEEP = 0
@@ -92,56 +98,21 @@ class CursorFinder:
             self.log(f"Scanning for composer line in region: {composer_region['width']}x{composer_region['height']} at ({composer_region['left']}, {composer_region['top']})")
             
             screenshot = self.sct.grab(composer_region)
-            img_array = np.array(screenshot)
-            
-            # Convert BGRA to RGB
-            img_array = img_array[:, :, [2,1,0]]
-            
-            # Look for exact pink color (251, 120, 198) with small tolerance for anti-aliasing
-            pink_mask = np.all((
-                (img_array[:, :, 0] >= 245) & (img_array[:, :, 0] <= 255) &  # R: 251 ±6
-                (img_array[:, :, 1] >= 115) & (img_array[:, :, 1] <= 125) &  # G: 120 ±5
-                (img_array[:, :, 2] >= 193) & (img_array[:, :, 2] <= 203)    # B: 198 ±5
-            ), axis=0)
+            img_array = Frame(screenshot).bgra
             
-            pink_count = np.sum(pink_mask)
-            self.log(f"Found {pink_count} pixels matching exact pink color")
+            # Exact pink (251, 120, 198) with small tolerance for anti-aliasing, ranked widest first
+            lines = self.pink_detector.find_lines(img_array)
+            self.log(f"Found {len(lines)} pink line candidates")
             
-            if pink_count == 0:
-                self.log("No matching pink pixels found")
+            if not lines:
+                self.log("No suitable pink line found")
                 return None
             
-            # Find connected components
-            from scipy import ndimage
-            labeled_array, num_features = ndimage.label(pink_mask)
-            self.log(f"Found {num_features} pink components")
-            
-            # Look for horizontal line components
-            for i in range(1, num_features + 1):
-                component_mask = labeled_array == i
-                y_coords, x_coords = np.where(component_mask)
-                if len(y_coords) == 0:
-                    continue
-                    
-                # Get component dimensions
-                width = np.max(x_coords) - np.min(x_coords)
-                height = np.max(y_coords) - np.min(y_coords)
-                
-                self.log(f"Component {i}: {width}x{height} pixels")
-                
-                # Look for components that are:
-                # - At least 10 pixels wide
-                # - 1-2 pixels high (allowing for some anti-aliasing)
-                if width >= 10 and height <= 2:
-                    center_x = int(np.mean(x_coords))
-                    center_y = int(np.mean(y_coords))
-                    screen_x = composer_region['left'] + center_x
-                    screen_y = composer_region['top'] + center_y
-                    self.log(f"Found pink line: {width}x{height} at ({screen_x}, {screen_y})")
-                    return (screen_x, screen_y)
-            
-            self.log("No suitable pink line found")
-            return None
+            line = lines[0]
+            screen_x = composer_region['left'] + line.center[0]
+            screen_y = composer_region['top'] + line.center[1]
+            self.log(f"Found pink line: {line.width}x{line.height} at ({screen_x}, {screen_y})")
+            return (screen_x, screen_y)
             
         except Exception as e:
             self.log(f"Error finding composer: {str(e)}")
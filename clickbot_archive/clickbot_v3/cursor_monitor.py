@@ -1,39 +1,87 @@
 """
 Monitor detection module for finding Cursor instances
 """
-import mss
 import numpy as np
 import cv2
 from PIL import Image
 import pytesseract
 import time
 
+import repo_root  # Shared helpers live at the repository root
+from monitor_layout import MonitorLayout
+from polarity_masks import PolarityMasks
+from theme_probe import ThemeProbe
+
 class CursorMonitor:
     def __init__(self):
-        self.sct = mss.mss()
+        # Monitors and an mss handle for the calling thread: the pipeline runs
+        # detection on its window stage thread, --sequential on the main one
+        self.layouts = MonitorLayout()
         self.last_cursor_monitor = None
+        # Light (>= 200) and dark (<= 50) text masks, built into reused buffers
+        self.polarity = PolarityMasks(light_level=200, dark_level=50)
+        # Title bar theme per monitor, so only the matching text polarity is read
+        self.theme_probe = ThemeProbe()
+        
+        # Identified monitor is cached with a thumbnail of its title band and
+        # the monitor layout; both are checked each call before rescanning
+        self._cached_layout = None
+        self._title_fingerprint = None
+        self.fingerprint_size = (64, 8)       # (width, height) of the thumbnail
+        self.fingerprint_tolerance = 8.0      # Mean gray-level difference still treated as the same band
+        self.scans = 0
+        self.revalidations = 0
         
-    def find_cursor_window(self):
+    def _grab_title_band(self, sct, monitor):
+        """Capture top portion of monitor where title would be"""
+        title_region = {
+            'left': monitor['left'],
+            'top': monitor['top'],
+            'width': monitor['width'],
+            'height': 100  # Just capture top portion
+        }
+        screenshot = sct.grab(title_region)
+        return Image.frombytes('RGB', screenshot.size, screenshot.rgb)
+    
+    def _fingerprint(self, img):
+        """Coarse grayscale thumbnail of a title band"""
+        gray = cv2.cvtColor(np.asarray(img), cv2.COLOR_RGB2GRAY)
+        return cv2.resize(gray, self.fingerprint_size, interpolation=cv2.INTER_AREA).astype(np.float32)
+    
+    def find_cursor_window(self, refresh=False):
         """
-        Scan all monitors for a Cursor window.
+        Find the monitor showing a Cursor window.
+        The last answer is reused while the monitor layout is unchanged and its
+        title band still matches the fingerprint taken when it was identified;
+        otherwise (or with refresh=True) all monitors are scanned with OCR.
         Returns: Monitor dict if found, None if not found
         """
+        sct, monitors, layout = self.layouts.current()
+        
+        if not refresh and self.last_cursor_monitor is not None:
+            if layout != self._cached_layout:
+                print("Monitor layout changed; rescanning monitors")
+            else:
+                fingerprint = self._fingerprint(self._grab_title_band(sct, self.last_cursor_monitor))
+                if np.abs(fingerprint - self._title_fingerprint).mean() <= self.fingerprint_tolerance:
+                    self.revalidations += 1
+                    return self.last_cursor_monitor
+                print("Cursor title band changed; rescanning monitors")
+        
+        return self._scan_monitors(sct, monitors, layout)
+    
+    def _scan_monitors(self, sct, monitors, layout):
+        """Scan all monitors for a Cursor window with OCR."""
         print("\nScanning monitors for Cursor window...")
+        self.scans += 1
+        self.last_cursor_monitor = None
+        self._title_fingerprint = None
+        self._cached_layout = layout
         
-        # Skip first monitor (represents all monitors combined)
-        for i, monitor in enumerate(self.sct.monitors[1:], 1):
+        for i, monitor in enumerate(monitors, 1):
             print(f"\nChecking monitor {i}: {monitor['width']}x{monitor['height']} at ({monitor['left']}, {monitor['top']})")
             
-            # Capture top portion of monitor where title would be
-            title_region = {
-                'left': monitor['left'],
-                'top': monitor['top'],
-                'width': monitor['width'],
-                'height': 100  # Just capture top portion
-            }
-            
-            screenshot = self.sct.grab(title_region)
-            img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
+            img = self._grab_title_band(sct, monitor)
             
             # Save debug image
             debug_path = f'debug_monitor_{i}_title.png'
@@ -41,34 +89,28 @@ class CursorMonitor:
             print(f"Saved debug image: {debug_path}")
             
             # Try both light and dark text detection
-            text = self._detect_text(img)
+            text = self._detect_text(img, key=i)
             print(f"Found text: {text}")
             
             if any('cursor' in t.lower() for t in text):
                 print(f"Found Cursor on monitor {i}!")
                 self.last_cursor_monitor = monitor
+                self._title_fingerprint = self._fingerprint(img)
                 return monitor
         
         print("No Cursor window found on any monitor")
         return None
     
-    def _detect_text(self, img):
-        """Detect both light and dark text in image"""
+    def _detect_text(self, img, key=None):
+        """Detect light and/or dark text in image, depending on the theme of region `key`"""
         results = []
-        img_array = np.array(img)
-        
-        # Light text on dark background
-        light_mask = np.all((img_array >= [200, 200, 200]), axis=2)
-        light_result = np.zeros_like(img_array)
-        light_result[light_mask] = [255, 255, 255]
+        img_array = np.asarray(img)
         
-        # Dark text on light background
-        dark_mask = np.all((img_array <= [50, 50, 50]), axis=2)
-        dark_result = np.zeros_like(img_array)
-        dark_result[dark_mask] = [255, 255, 255]
+        # Light text on a dark theme, dark text on a light one (both if unsure)
+        polarities = self.theme_probe.text_polarities(key, img_array)
         
-        # Try OCR on both
-        for result in [light_result, dark_result]:
+        # Try OCR on each
+        for _, result in self.polarity.select(img_array, polarities):
             result_pil = Image.fromarray(result)
             text = pytesseract.image_to_string(result_pil).strip().split('\n')
             results.extend([t for t in text if t.strip()])
@@ -1,14 +1,21 @@
 """
 Main script for Cursor accept bot
 """
+import asyncio
 import time
 import sys
+import numpy as np
 from cursor_monitor import CursorMonitor
 from composer_detector import ComposerDetector
 from accept_watcher import AcceptWatcher
+from text_regions import TextRegionService
+from pipeline import AcceptPipeline
 from PIL import Image
 import mss
 
+import repo_root  # Shared helpers live at the repository root
+from clickbot.poll_scheduler import AdaptivePollScheduler
+
 def check_permissions():
     """Check required permissions"""
     # TODO: Add permission checking from v2
@@ -19,10 +26,26 @@ def main():
     
     # Initialize components
     cursor_monitor = CursorMonitor()
-    composer_detector = ComposerDetector()
-    accept_watcher = AcceptWatcher()
+    # Both detectors query the same per-frame text regions
+    text_regions = TextRegionService()
+    composer_detector = ComposerDetector(text_regions)
+    accept_watcher = AcceptWatcher(text_regions)
+    scheduler = AdaptivePollScheduler(floor_interval=0.1, ceiling_interval=2.0)
+    
+    if '--sequential' in sys.argv:
+        run_sequential(cursor_monitor, composer_detector, accept_watcher, scheduler)
+        return
     
-    # Main loop
+    # Each stage runs as its own task; slow window/composer detection doesn't stall accept detection
+    pipeline = AcceptPipeline(cursor_monitor, composer_detector, accept_watcher, scheduler)
+    try:
+        asyncio.run(pipeline.run())
+    except KeyboardInterrupt:
+        print("\nStopping...")
+    print(f"Stage stats: {pipeline.stats()}")
+
+def run_sequential(cursor_monitor, composer_detector, accept_watcher, scheduler):
+    """Run every step in turn on one thread (the original loop)"""
     while True:
         try:
             # Find Cursor window
@@ -40,6 +63,8 @@ def main():
                 screenshot = sct.grab(window_region)
                 img = Image.frombytes('RGB', screenshot.size, screenshot.rgb)
             
+            accept_pos = None
+            
             # Find composer area
             composer_region = composer_detector.find_composer(img)
             if composer_region:
@@ -50,18 +75,20 @@ def main():
                 composer_img = img.crop((x, y, x+w, y+h))
                 composer_img.save('debug_composer.png')
                 
-                # Look for accept button in composer area
+                # Look for accept button in composer area, reusing this frame's text regions
                 accept_pos = accept_watcher.find_accept_button(
-                    composer_img,
+                    img,
                     base_x=window_region['left'] + x,
-                    base_y=window_region['top'] + y
+                    base_y=window_region['top'] + y,
+                    within=composer_region
                 )
                 
                 if accept_pos:
                     accept_watcher.try_click_accept()
             
-            # Short sleep to prevent high CPU usage
-            time.sleep(0.5)
+            # Poll faster while the window is changing, back off while it is static
+            scheduler.observe(np.asarray(img), accept_seen=accept_pos is not None)
+            scheduler.sleep()
             
         except KeyboardInterrupt:
             print("\nStopping...")
@@ -0,0 +1,198 @@
+"""
+Staged asyncio pipeline for the Cursor accept bot
+
+Each stage is its own task: window detection, capture, composer detection,
+accept detection and clicking. Stages hand work on through bounded queues
+that keep only the newest item, so a slow stage drops stale frames instead of
+building a backlog. Blocking OpenCV/OCR/mouse work runs on a single worker
+thread per stage under that stage's deadline. A slow window or composer
+detection never stalls accept detection: it keeps working from the last
+known window and composer region.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import mss
+import numpy as np
+from PIL import Image
+
+class StageTimeout(Exception):
+    """A stage job missed its deadline"""
+
+class Stage:
+    def __init__(self, name, deadline):
+        self.name = name
+        # Seconds a job may take before the stage moves on without its result
+        self.deadline = deadline
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=name)
+        self.pending = None
+        self.runs = 0
+        self.misses = 0
+
+    async def run(self, fn, *args):
+        """Run fn(*args) on the stage's worker thread and return its result"""
+        if self.pending is not None and not self.pending.done():
+            # Let an overdue job finish before queueing more work behind it;
+            # only this stage waits, the others keep running
+            await asyncio.wait({self.pending})
+
+        self.pending = asyncio.wrap_future(self.executor.submit(fn, *args))
+        # An overdue job may fail after nobody is waiting for it any more
+        self.pending.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.runs += 1
+        try:
+            return await asyncio.wait_for(asyncio.shield(self.pending), self.deadline)
+        except asyncio.TimeoutError:
+            self.misses += 1
+            raise StageTimeout(f"{self.name} missed its {self.deadline:.1f}s deadline")
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False)
+
+def offer(queue, item):
+    """Put item on a bounded queue, dropping the oldest item if it is full"""
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+class AcceptPipeline:
+    def __init__(self, cursor_monitor, composer_detector, accept_watcher, scheduler,
+                 window_interval=2.0, window_deadline=10.0, composer_deadline=3.0,
+                 accept_deadline=2.0, click_deadline=3.0):
+        self.cursor_monitor = cursor_monitor
+        self.composer_detector = composer_detector
+        self.accept_watcher = accept_watcher
+        self.scheduler = scheduler
+        # Seconds between window detections
+        self.window_interval = window_interval
+
+        self.stages = {
+            'window': Stage('window', window_deadline),
+            'capture': Stage('capture', 1.0),
+            'composer': Stage('composer', composer_deadline),
+            'accept': Stage('accept', accept_deadline),
+            'click': Stage('click', click_deadline),
+        }
+
+        # Latest results, read by downstream stages without waiting on upstream ones
+        self.window_region = None
+        self.composer = None          # (window_region, composer_region) it was found in
+        self.accept_seen = False
+
+        # Newest frame for each detector, and the newest click to make; created
+        # in run() so they bind to the running loop (needed before Python 3.10)
+        self.composer_frames = None
+        self.accept_frames = None
+        self.clicks = None
+
+    async def window_stage(self):
+        while True:
+            try:
+                found = await self.stages['window'].run(self.cursor_monitor.find_cursor_window)
+                if found:
+                    self.window_region = dict(self.cursor_monitor.get_cursor_region())
+                else:
+                    print("No Cursor window found")
+            except StageTimeout as e:
+                print(f"{e}; keeping window {self.window_region}")
+            except Exception as e:
+                print(f"Error finding Cursor window: {str(e)}")
+            await asyncio.sleep(self.window_interval)
+
+    def _grab(self, region):
+        with mss.mss() as sct:
+            screenshot = sct.grab(region)
+            return Image.frombytes('RGB', screenshot.size, screenshot.rgb)
+
+    async def capture_stage(self):
+        while True:
+            region = self.window_region
+            if region is None:
+                await asyncio.sleep(0.1)
+                continue
+            try:
+                img = await self.stages['capture'].run(self._grab, region)
+                frame = (region, img)
+                offer(self.composer_frames, frame)
+                offer(self.accept_frames, frame)
+                # Poll faster while the window is changing, back off while it is static
+                self.scheduler.observe(np.asarray(img), accept_seen=self.accept_seen)
+            except StageTimeout as e:
+                print(e)
+            except Exception as e:
+                print(f"Error capturing window: {str(e)}")
+            await asyncio.sleep(self.scheduler.interval)
+
+    def _find_composer(self, img):
+        composer_region = self.composer_detector.find_composer(img)
+        if composer_region:
+            x, y, w, h = composer_region
+            img.crop((x, y, x+w, y+h)).save('debug_composer.png')
+        return composer_region
+
+    async def composer_stage(self):
+        while True:
+            region, img = await self.composer_frames.get()
+            try:
+                composer_region = await self.stages['composer'].run(self._find_composer, img)
+                if composer_region:
+                    print(f"Found composer at ({composer_region[0]}, {composer_region[1]})")
+                    self.composer = (region, composer_region)
+            except StageTimeout as e:
+                print(f"{e}; keeping composer region")
+            except Exception as e:
+                print(f"Error finding composer: {str(e)}")
+
+    async def accept_stage(self):
+        while True:
+            region, img = await self.accept_frames.get()
+            # Last known composer region, as long as it was found in this window
+            if self.composer is None or self.composer[0] != region:
+                continue
+            composer_region = self.composer[1]
+            x, y, _, _ = composer_region
+            try:
+                accept_pos = await self.stages['accept'].run(
+                    self.accept_watcher.find_accept_button, img,
+                    region['left'] + x, region['top'] + y, composer_region)
+                self.accept_seen = accept_pos is not None
+                if accept_pos:
+                    offer(self.clicks, accept_pos)
+            except StageTimeout as e:
+                print(e)
+            except Exception as e:
+                print(f"Error finding accept button: {str(e)}")
+
+    async def click_stage(self):
+        while True:
+            await self.clicks.get()
+            try:
+                await self.stages['click'].run(self.accept_watcher.try_click_accept)
+            except StageTimeout as e:
+                print(e)
+            except Exception as e:
+                print(f"Error clicking accept button: {str(e)}")
+
+    async def run(self):
+        self.composer_frames = asyncio.Queue(maxsize=1)
+        self.accept_frames = asyncio.Queue(maxsize=1)
+        self.clicks = asyncio.Queue(maxsize=1)
+        tasks = [
+            asyncio.create_task(self.window_stage(), name='window'),
+            asyncio.create_task(self.capture_stage(), name='capture'),
+            asyncio.create_task(self.composer_stage(), name='composer'),
+            asyncio.create_task(self.accept_stage(), name='accept'),
+            asyncio.create_task(self.click_stage(), name='click'),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for stage in self.stages.values():
+                stage.shutdown()
+
+    def stats(self):
+        """Runs and missed deadlines per stage"""
+        return {name: {'runs': stage.runs, 'misses': stage.misses} for name, stage in self.stages.items()}
@@ -0,0 +1,91 @@
+"""
+Text region extraction shared by the composer detector and accept watcher
+"""
+import cv2
+import numpy as np
+import threading
+
+import repo_root  # Shared helpers live at the repository root
+from ocr_atlas import batch_ocr
+from polarity_masks import PolarityMasks
+from theme_probe import ThemeProbe
+
+class TextRegionService:
+    def __init__(self, min_width=40, min_height=20, theme_probe=None, region_key="window"):
+        # Smallest box worth reading; detectors can ask for larger ones
+        self.min_width = min_width
+        self.min_height = min_height
+        # Light (>= 200) and dark (<= 50) text masks, built into reused buffers
+        self.polarity = PolarityMasks(light_level=200, dark_level=50)
+        # Theme of the watched region, so only the matching text polarity is read
+        self.theme_probe = theme_probe or ThemeProbe()
+        self.region_key = region_key
+        # Frame the cached regions were extracted from; the lock lets detectors
+        # on different threads share one extraction
+        self._lock = threading.Lock()
+        self._frame = None
+        self._regions = []
+        # Number of frames actually extracted (for checking sharing works)
+        self.extractions = 0
+
+    def regions(self, screenshot):
+        """
+        Text regions of a frame as ((x, y, w, h), text) pairs, from the text
+        polarity (or polarities) the region's theme calls for.
+        Extracted once per frame: asking again with the same screenshot object
+        returns the cached result.
+        """
+        with self._lock:
+            if screenshot is not self._frame:
+                self._regions = self._extract(screenshot)
+                self._frame = screenshot
+                self.extractions += 1
+            return self._regions
+
+    def _extract(self, screenshot):
+        img_array = np.asarray(screenshot)
+
+        # Light text on a dark theme, dark text on a light one (both if unsure)
+        polarities = self.theme_probe.text_polarities(self.region_key, img_array)
+
+        # Collect candidate boxes from the masks, then OCR them in one atlas pass
+        boxes = []
+        crops = []
+        for _, mask in self.polarity.select(img_array, polarities):
+            contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+            for contour in contours:
+                x, y, w, h = cv2.boundingRect(contour)
+                if w < self.min_width or h < self.min_height:
+                    continue
+                boxes.append((x, y, w, h))
+                crops.append(mask[y:y+h, x:x+w])
+
+        results = []
+        for box, text in zip(boxes, batch_ocr(crops)):
+            text = text.strip()
+            if text:
+                results.append((box, text))
+
+        return results
+
+    def query(self, screenshot, keywords, min_size=(0, 0), max_size=None, within=None):
+        """
+        Regions of a frame whose text contains any of the keywords.
+        min_size/max_size are (w, h) limits on the box; within is an (x, y, w, h)
+        rectangle the box must lie inside, and returned boxes are then relative
+        to it.
+        """
+        matches = []
+        for (x, y, w, h), text in self.regions(screenshot):
+            if w < min_size[0] or h < min_size[1]:
+                continue
+            if max_size and (w > max_size[0] or h > max_size[1]):
+                continue
+            if within:
+                wx, wy, ww, wh = within
+                if x < wx or y < wy or x + w > wx + ww or y + h > wy + wh:
+                    continue
+                x, y = x - wx, y - wy
+            if any(keyword in text.lower() for keyword in keywords):
+                matches.append(((x, y, w, h), text))
+        return matches
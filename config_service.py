@@ -0,0 +1,137 @@
+"""
+Load a JSON config once and keep it current while the file changes.
+
+Control loops used to reopen and parse the config every iteration. The
+service loads it once and a background thread watches the file's stat
+(mtime, size, inode) at a modest interval. When the file changes the new
+contents are parsed and validated, then swapped in with a single reference
+assignment, and subscribers are told. Readers just use `service.config`, which
+costs no syscalls. A half-written or invalid file is logged and ignored and
+the previous config stays live. Writers go through write_config, which
+replaces the file atomically, so the watcher never sees a partial write.
+"""
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Called as validator(config) and raises ValueError when the config is unusable
+ConfigValidator = Callable[[Dict[str, Any]], None]
+# Called as subscriber(old_config, new_config); old_config is None on first load
+ConfigSubscriber = Callable[[Optional[Dict[str, Any]], Dict[str, Any]], None]
+
+def require_keys(*paths: str) -> ConfigValidator:
+    """Validator requiring each dotted path (e.g. "composer_area.top_left.x") to exist."""
+    def validate(config: Dict[str, Any]):
+        for path in paths:
+            node = config
+            for key in path.split('.'):
+                if not isinstance(node, dict) or key not in node:
+                    raise ValueError(f"missing '{path}'")
+                node = node[key]
+    return validate
+
+def write_config(path: str, config: Dict[str, Any]):
+    """Write config as JSON by replacing the file atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.config-', suffix='.json')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(config, f, indent=4)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+class ConfigService:
+    """In-memory view of a JSON config file, reloaded when the file changes."""
+
+    def __init__(self, path: str, validator: Optional[ConfigValidator] = None, poll_interval: float = 0.5):
+        self.path = path
+        self.validator = validator
+        self.poll_interval = poll_interval
+        self.config: Optional[Dict[str, Any]] = None   # None until a valid file has been loaded
+        self.version = 0                                # Bumped on every swap
+        self._stat_key: Optional[Tuple[int, int, int]] = None
+        self._subscribers: List[ConfigSubscriber] = []
+        self._lock = threading.Lock()   # save() and the watcher thread may check at once
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self, subscriber: ConfigSubscriber):
+        self._subscribers.append(subscriber)
+
+    def _file_key(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def check(self) -> bool:
+        """Reload if the file changed since the last look; True when a new config was swapped in."""
+        with self._lock:
+            return self._reload_if_changed()
+
+    def _reload_if_changed(self) -> bool:
+        key = self._file_key()
+        if key == self._stat_key:
+            return False
+        self._stat_key = key
+        if key is None:
+            logging.warning(f"Config {self.path} is missing; keeping the current config")
+            return False
+
+        try:
+            with open(self.path, 'r') as f:
+                config = json.load(f)
+            if self.validator:
+                self.validator(config)
+        except (OSError, ValueError) as e:
+            # json.JSONDecodeError is a ValueError too
+            logging.warning(f"Ignoring invalid config {self.path}: {str(e)}")
+            return False
+
+        if config == self.config:
+            return False
+        old, self.config = self.config, config
+        self.version += 1
+        logging.info(f"Loaded config {self.path} (version {self.version})")
+        for subscriber in self._subscribers:
+            try:
+                subscriber(old, config)
+            except Exception as e:
+                logging.error(f"Config subscriber failed: {str(e)}")
+        return True
+
+    def save(self, config: Dict[str, Any]):
+        """Write config to the file and make it live immediately."""
+        if self.validator:
+            self.validator(config)
+        write_config(self.path, config)
+        self.check()
+
+    def _watch(self):
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.check()
+            except Exception as e:
+                logging.error(f"Error watching config {self.path}: {str(e)}")
+
+    def start(self) -> "ConfigService":
+        """Load the config now and keep watching the file on a daemon thread."""
+        self.check()
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="config-watch", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
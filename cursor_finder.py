@@ -1,6 +1,10 @@
 import mss
 import numpy as np
 from PIL import Image
+from frame_capture import FrameGrabber
+from monitor_layout import MonitorLayout
+from pink_line import PinkLineDetector, PINK_LOOSE
+from theme_probe import dark_pixel_ratio
 import pyautogui
 import time
 from datetime import datetime
@@ -10,6 +14,15 @@ import os
 # Force unbuffered output
 os.environ['PYTHONUNBUFFERED'] = '1'
 
+# Dark-theme test: every channel at or below this level
+DARK_LEVEL = 30
+# Classify monitors from every Nth pixel in each direction (1/64 of the pixels)
+DARK_SAMPLE_STRIDE = 8
+# Sample only a centred crop of this fraction of each monitor dimension (a quarter of the screen)
+DARK_SAMPLE_CROP = 0.5
+# Re-enumerate monitors (which opens a new mss handle) at most this often, in seconds
+MONITOR_REFRESH_INTERVAL = 5.0
+
 def log(message):
     """Print message with timestamp"""
     timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
@@ -66,7 +79,13 @@ def check_permissions():
 class CursorFinder:
     def __init__(self):
         self.sct = mss.mss()
+        self.grabber = FrameGrabber(self.sct)
+        self.layouts = MonitorLayout(MONITOR_REFRESH_INTERVAL)
         self.cursor_monitor = None
+        # Monitor layout -> (index, dark ratio) of the Cursor monitor, and per-monitor dark ratios
+        self._layout_cache = {}
+        self.dark_ratios = {}
+        self.pink_detector = PinkLineDetector(PINK_LOOSE)
         # Speed up mouse movement
         pyautogui.MINIMUM_DURATION = 0
         pyautogui.MINIMUM_SLEEP = 0
@@ -77,28 +96,46 @@ class CursorFinder:
         timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
         print(f"[{timestamp}] {message}", flush=True)
         
-    def find_cursor_window(self):
-        """Find monitor with Cursor window"""
+    def dark_ratio(self, monitor):
+        """Fraction of dark pixels on a strided grid of a centred crop of the monitor"""
+        width = max(1, int(monitor['width'] * DARK_SAMPLE_CROP))
+        height = max(1, int(monitor['height'] * DARK_SAMPLE_CROP))
+        region = {
+            'left': monitor['left'] + (monitor['width'] - width) // 2,
+            'top': monitor['top'] + (monitor['height'] - height) // 2,
+            'width': width,
+            'height': height
+        }
+        return dark_pixel_ratio(self.grabber.grab(region).bgra, DARK_LEVEL, DARK_SAMPLE_STRIDE)
+        
+    def find_cursor_window(self, refresh=False):
+        """Find monitor with Cursor window
+        
+        The result is cached per monitor layout; pass refresh=True to rescan anyway.
+        The layout itself is re-read at most every MONITOR_REFRESH_INTERVAL seconds
+        (or on refresh), so a display change can take that long to be noticed.
+        """
         try:
             self.log("\n=== Stage 1: Finding Cursor Window ===")
+            _, monitors, layout = self.layouts.current(refresh)
+            if not refresh and layout in self._layout_cache:
+                i, ratio = self._layout_cache[layout]
+                self.cursor_monitor = monitors[i - 1]
+                self.log(f"Using cached Cursor monitor {i} (dark ratio {ratio:.2%})")
+                return self.cursor_monitor
+            
             self.log("Listing all monitors:")
-            # Skip first monitor (represents all monitors combined)
-            for i, monitor in enumerate(self.sct.monitors[1:], 1):
+            self.dark_ratios = {}
+            # Numbered from 1 like sct.monitors, whose entry 0 is all monitors combined
+            for i, monitor in enumerate(monitors, 1):
                 self.log(f"Monitor {i}:")
                 self.log(f"  Size: {monitor['width']}x{monitor['height']}")
                 self.log(f"  Position: ({monitor['left']}, {monitor['top']})")
                 self.log(f"  Bounds: ({monitor['left']}, {monitor['top']}) to ({monitor['left'] + monitor['width']}, {monitor['top'] + monitor['height']})")
                 
-                # Capture full monitor
-                screenshot = self.sct.grab(monitor)
-                img_array = np.array(screenshot)
-                
-                # Convert BGRA to RGB
-                img_array = img_array[:, :, [2,1,0]]
-                
                 # Look for dark theme UI colors (background should be dark)
-                dark_mask = np.all(img_array <= [30, 30, 30], axis=2)
-                dark_pixel_ratio = np.sum(dark_mask) / (monitor['width'] * monitor['height'])
+                dark_pixel_ratio = self.dark_ratio(monitor)
+                self.dark_ratios[i] = dark_pixel_ratio
                 self.log(f"  Dark pixel ratio: {dark_pixel_ratio:.2%}")
                 
                 # If more than 40% dark pixels, likely the Cursor window
@@ -109,17 +146,23 @@ class CursorFinder:
                     self.log(f"  Window position: ({monitor['left']}, {monitor['top']})")
                     self.log(f"  Window bounds: ({monitor['left']}, {monitor['top']}) to ({monitor['left'] + monitor['width']}, {monitor['top'] + monitor['height']})")
                     self.cursor_monitor = monitor
+                    self._layout_cache = {layout: (i, dark_pixel_ratio)}
                     return monitor
             
             self.log("\n❌ Could not find Cursor window on any monitor")
+            self._layout_cache = {}
             return None
             
         except Exception as e:
             self.log(f"\n❌ Error scanning monitors: {str(e)}")
+            self._layout_cache = {}
             return None
             
-    def find_pink_line(self):
-        """Find pink line in top portion of window"""
+    def find_pink_line(self, debug=False):
+        """Find pink line in top portion of window
+        
+        With debug=True, also dump channel statistics and debug images of the capture.
+        """
         try:
             self.log("\n=== Stage 2: Finding Pink Line ===")
             
@@ -137,91 +180,82 @@ class CursorFinder:
             self.log(f"  Bounds: ({top_region['left']}, {top_region['top']}) to ({top_region['left'] + top_region['width']}, {top_region['top'] + top_region['height']})")
             
             # Capture region
-            screenshot = self.sct.grab(top_region)
-            img_array = np.array(screenshot)
+            img_array = self.grabber.grab(top_region).bgra
             
-            # Debug color info
-            self.log("\nImage Analysis:")
-            self.log(f"  Shape: {img_array.shape}")
-            self.log(f"  Data type: {img_array.dtype}")
-            self.log(f"  Memory layout: {img_array.flags}")
+            if debug:
+                # Debug color info
+                self.log("\nImage Analysis:")
+                self.log(f"  Shape: {img_array.shape}")
+                self.log(f"  Data type: {img_array.dtype}")
+                self.log(f"  Memory layout: {img_array.flags}")
             
-            # Save raw screenshot data
-            np.save("debug_raw_screenshot.npy", img_array)
-            self.log("\nSaved raw screenshot data to debug_raw_screenshot.npy")
+                # Save raw screenshot data
+                np.save("debug_raw_screenshot.npy", img_array)
+                self.log("\nSaved raw screenshot data to debug_raw_screenshot.npy")
             
-            # Analyze each channel
-            self.log("\nChannel Analysis (BGRA format):")
-            channel_names = ['Blue', 'Green', 'Red', 'Alpha']
-            for i, name in enumerate(channel_names):
-                channel = img_array[:, :, i]
-                self.log(f"\n{name} Channel:")
-                self.log(f"  Range: {np.min(channel)} to {np.max(channel)}")
-                self.log(f"  Mean: {np.mean(channel):.2f}")
-                self.log(f"  Std dev: {np.std(channel):.2f}")
-                unique_vals = np.unique(channel)
-                self.log(f"  Unique values: {len(unique_vals)} values")
-                self.log(f"  Most common values: {np.bincount(channel.flatten()).argsort()[-5:][::-1]}")
+                # Analyze each channel
+                self.log("\nChannel Analysis (BGRA format):")
+                channel_names = ['Blue', 'Green', 'Red', 'Alpha']
+                for i, name in enumerate(channel_names):
+                    channel = img_array[:, :, i]
+                    self.log(f"\n{name} Channel:")
+                    self.log(f"  Range: {np.min(channel)} to {np.max(channel)}")
+                    self.log(f"  Mean: {np.mean(channel):.2f}")
+                    self.log(f"  Std dev: {np.std(channel):.2f}")
+                    unique_vals = np.unique(channel)
+                    self.log(f"  Unique values: {len(unique_vals)} values")
+                    self.log(f"  Most common values: {np.bincount(channel.flatten()).argsort()[-5:][::-1]}")
             
-            # Find potential pink pixels (very loose thresholds)
-            self.log("\nSearching for pink-ish pixels:")
-            # Look for any pixels where red > green and red > blue
-            potential_pink = (img_array[:, :, 2] > img_array[:, :, 1]) & (img_array[:, :, 2] > img_array[:, :, 0])
-            pink_count = np.sum(potential_pink)
-            self.log(f"Found {pink_count} pixels where red is dominant")
+                # Find potential pink pixels (very loose thresholds)
+                self.log("\nSearching for pink-ish pixels:")
+                # Look for any pixels where red > green and red > blue
+                potential_pink = (img_array[:, :, 2] > img_array[:, :, 1]) & (img_array[:, :, 2] > img_array[:, :, 0])
+                pink_count = np.sum(potential_pink)
+                self.log(f"Found {pink_count} pixels where red is dominant")
             
-            if pink_count > 0:
-                # Analyze these pixels
-                pink_y, pink_x = np.where(potential_pink)
-                self.log("\nAnalyzing pixels where red is dominant:")
-                self.log(f"Found pixels at {len(pink_y)} positions")
+                if pink_count > 0:
+                    # Analyze these pixels
+                    pink_y, pink_x = np.where(potential_pink)
+                    self.log("\nAnalyzing pixels where red is dominant:")
+                    self.log(f"Found pixels at {len(pink_y)} positions")
                 
-                # Group by y-coordinate to find horizontal lines
-                y_counts = np.bincount(pink_y)
-                lines = np.where(y_counts >= 10)[0]  # Lines with at least 10 pink pixels
-                self.log(f"\nFound {len(lines)} rows with 10+ red-dominant pixels:")
+                    # Group by y-coordinate to find horizontal lines
+                    y_counts = np.bincount(pink_y)
+                    lines = np.where(y_counts >= 10)[0]  # Lines with at least 10 pink pixels
+                    self.log(f"\nFound {len(lines)} rows with 10+ red-dominant pixels:")
                 
-                for y in lines:
-                    x_coords = pink_x[pink_y == y]
-                    self.log(f"\nRow {y}:")
-                    self.log(f"  {len(x_coords)} pixels")
-                    self.log(f"  X range: {np.min(x_coords)} to {np.max(x_coords)}")
-                    # Sample some colors from this line
-                    for x in x_coords[:5]:  # Show first 5 pixels
-                        color = img_array[y, x]
-                        self.log(f"  Color at ({x}, {y}): BGRA = {color}")
-            
-            # Save visualization
-            vis_img = img_array.copy()
-            vis_img[potential_pink] = [0, 255, 0, 255]  # Mark potential pink pixels in green
-            Image.fromarray(vis_img).save("debug_pink_pixels.png")
-            self.log("\nSaved visualization to debug_pink_pixels.png")
-            
-            # Now try our original pink detection
-            pink_mask = (
-                (img_array[:, :, 2] >= 200) & (img_array[:, :, 2] <= 255) &  # R: High
-                (img_array[:, :, 1] >= 80) & (img_array[:, :, 1] <= 160) &   # G: Medium
-                (img_array[:, :, 0] >= 150) & (img_array[:, :, 0] <= 220)    # B: Medium-high
-            )
+                    for y in lines:
+                        x_coords = pink_x[pink_y == y]
+                        self.log(f"\nRow {y}:")
+                        self.log(f"  {len(x_coords)} pixels")
+                        self.log(f"  X range: {np.min(x_coords)} to {np.max(x_coords)}")
+                        # Sample some colors from this line
+                        for x in x_coords[:5]:  # Show first 5 pixels
+                            color = img_array[y, x]
+                            self.log(f"  Color at ({x}, {y}): BGRA = {color}")
             
-            pink_pixels = np.where(pink_mask)
-            pink_count = len(pink_pixels[0])
+                # Save visualization
+                vis_img = img_array.copy()
+                vis_img[potential_pink] = [0, 255, 0, 255]  # Mark potential pink pixels in green
+                Image.fromarray(vis_img).save("debug_pink_pixels.png")
+                self.log("\nSaved visualization to debug_pink_pixels.png")
             
-            self.log(f"\nFound {pink_count} pixels matching our pink threshold")
+            # Rank line-shaped pink components in one labelling pass
+            lines = self.pink_detector.find_lines(img_array)
+            self.log(f"\nFound {len(lines)} pink line candidates")
             
-            if pink_count == 0:
-                self.log("❌ No pink pixels found matching our threshold")
+            if not lines:
+                self.log("❌ No pink line found matching our threshold")
                 return None
                 
-            # Find rightmost pink line
-            min_x = np.min(pink_pixels[1])
-            max_x = np.max(pink_pixels[1])
-            min_y = np.min(pink_pixels[0])
-            max_y = np.max(pink_pixels[0])
+            # Widest line first, rightmost on ties
+            line = lines[0]
+            min_x, min_y = line.x, line.y
+            max_x, max_y = line.x + line.width - 1, line.y + line.height - 1
             
             self.log("\n✓ Found pink line!")
-            self.log(f"  Width: {max_x - min_x + 1} pixels")
-            self.log(f"  Height: {max_y - min_y + 1} pixels")
+            self.log(f"  Width: {line.width} pixels")
+            self.log(f"  Height: {line.height} pixels")
             self.log(f"  Window-relative position: ({min_x}, {min_y}) to ({max_x}, {max_y})")
             
             return {
@@ -229,8 +263,8 @@ class CursorFinder:
                 'max_x': max_x + self.cursor_monitor['left'],
                 'min_y': min_y + self.cursor_monitor['top'],
                 'max_y': max_y + self.cursor_monitor['top'],
-                'width': max_x - min_x + 1,
-                'height': max_y - min_y + 1
+                'width': line.width,
+                'height': line.height
             }
             
         except Exception as e:
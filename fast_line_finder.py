@@ -1,16 +1,21 @@
 import numpy as np
 import cv2
 
-def find_contrast_line(img, window_bounds):
-    """Find contrast line without saving debug images."""
+def find_contrast_line(img, window_bounds, gray=None):
+    """Find contrast line without saving debug images.
+    
+    Pass `gray` when the caller already has a grayscale copy of `img` (e.g. from
+    frame_capture.Frame.gray()) to skip converting the window region again.
+    """
     # Extract window region
-    window_region = img[
-        window_bounds['y']:window_bounds['y'] + window_bounds['height'],
-        window_bounds['x']:window_bounds['x'] + window_bounds['width']
-    ]
+    rows = slice(window_bounds['y'], window_bounds['y'] + window_bounds['height'])
+    cols = slice(window_bounds['x'], window_bounds['x'] + window_bounds['width'])
+    window_region = img[rows, cols]
     
     # Convert to grayscale and ensure float type for calculations
-    if window_region.shape[-1] == 4:  # RGBA
+    if gray is not None:
+        gray = gray[rows, cols].astype(np.float32)
+    elif window_region.shape[-1] == 4:  # RGBA
         gray = cv2.cvtColor(window_region, cv2.COLOR_BGRA2GRAY).astype(np.float32)
     else:  # RGB
         gray = cv2.cvtColor(window_region, cv2.COLOR_BGR2GRAY).astype(np.float32)
@@ -1,82 +1,167 @@
-import mss
 import numpy as np
 import cv2
+from frame_capture import FrameGrabber
+from frame_context import FrameContext
 
-def find_window_bounds():
-    """Find Cursor window bounds without saving debug images."""
-    with mss.mss() as sct:
-        # Use primary monitor
-        monitor = sct.monitors[0]
-        screenshot = sct.grab(monitor)
-        img = np.array(screenshot)
-        
-        # Convert to grayscale (handle both RGB and RGBA)
-        if img.shape[-1] == 4:  # RGBA
-            gray = cv2.cvtColor(img, cv2.COLOR_BGRA2GRAY)
-        else:  # RGB
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        
-        # Edge detection with more sensitive thresholds
-        edges = cv2.Canny(gray, 30, 100)  # Lower thresholds to detect more edges
-        
-        # Find horizontal lines
-        horizontal_lines = []
-        for y in range(edges.shape[0]):
-            line_start = None
-            for x in range(edges.shape[1]):
-                if edges[y, x] > 0:
-                    if line_start is None:
-                        line_start = x
-                elif line_start is not None:
-                    length = x - line_start
-                    if length > 50:  # Reduced minimum length to detect more lines
-                        horizontal_lines.append((y, line_start, x, length))
-                    line_start = None
-        
-        # Sort by length
-        horizontal_lines.sort(key=lambda x: x[3], reverse=True)
+# Canny thresholds shared by every strategy
+CANNY_LOW = 30
+CANNY_HIGH = 100
+
+def find_window_bounds(ctx=None, strategy="edges", **options):
+    """Find Cursor window bounds without saving debug images.
+    
+    Pass a FrameContext of the primary monitor to reuse its derived images;
+    otherwise the monitor is captured here. `strategy` names an entry of
+    STRATEGIES; extra options go to that strategy.
+    """
+    if ctx is None:
+        with FrameGrabber() as grabber:
+            # Use primary monitor
+            frame = grabber.grab(grabber.sct.monitors[0])
+            return find_window_bounds(FrameContext(frame), strategy, **options)
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown window bounds strategy '{strategy}' (expected one of {sorted(STRATEGIES)})")
+    return STRATEGIES[strategy](ctx, **options)
+
+def _bounds_dict(left, top, right, bottom):
+    # Validate bounds
+    if right <= left or bottom <= top:
+        return None
         
-        if len(horizontal_lines) < 5:  # Need at least 5 horizontal lines
-            return None
-            
-        # Find vertical lines
-        vertical_lines = []
+    return {
+        'x': left,
+        'y': top,
+        'width': right - left,
+        'height': bottom - top,
+        'monitor_relative_x': left,
+        'monitor_relative_y': top
+    }
+
+def edge_run_bounds(ctx):
+    """Bounds from the longest runs of edge pixels at full resolution."""
+    # Edge detection with more sensitive thresholds
+    edges = ctx.canny(CANNY_LOW, CANNY_HIGH)  # Lower thresholds to detect more edges
+    
+    # Find horizontal lines
+    horizontal_lines = []
+    for y in range(edges.shape[0]):
+        line_start = None
         for x in range(edges.shape[1]):
-            line_start = None
-            for y in range(edges.shape[0]):
-                if edges[y, x] > 0:
-                    if line_start is None:
-                        line_start = y
-                elif line_start is not None:
-                    length = y - line_start
-                    if length > 50:  # Reduced minimum length
-                        vertical_lines.append((x, line_start, y, length))
-                    line_start = None
-                    
-        # Sort by length
-        vertical_lines.sort(key=lambda x: x[3], reverse=True)
+            if edges[y, x] > 0:
+                if line_start is None:
+                    line_start = x
+            elif line_start is not None:
+                length = x - line_start
+                if length > 50:  # Reduced minimum length to detect more lines
+                    horizontal_lines.append((y, line_start, x, length))
+                line_start = None
+    
+    # Sort by length
+    horizontal_lines.sort(key=lambda x: x[3], reverse=True)
+    
+    if len(horizontal_lines) < 5:  # Need at least 5 horizontal lines
+        return None
         
-        if len(vertical_lines) < 3:  # Need at least 3 vertical lines
-            return None
-            
-        # Find window bounds
-        try:
-            top = min(l[0] for l in horizontal_lines[:2])  # Use top 2 horizontal lines
-            bottom = max(l[0] for l in horizontal_lines[:5])  # Use top 5 for bottom
-            left = min(l[0] for l in vertical_lines[:3])  # Use leftmost 3 vertical lines
-            right = max(l[0] for l in vertical_lines[:3])  # Use rightmost 3 vertical lines
-            
-            # Validate bounds
-            if right <= left or bottom <= top:
-                return None
+    # Find vertical lines
+    vertical_lines = []
+    for x in range(edges.shape[1]):
+        line_start = None
+        for y in range(edges.shape[0]):
+            if edges[y, x] > 0:
+                if line_start is None:
+                    line_start = y
+            elif line_start is not None:
+                length = y - line_start
+                if length > 50:  # Reduced minimum length
+                    vertical_lines.append((x, line_start, y, length))
+                line_start = None
                 
-            return {
-                'x': left,
-                'y': top,
-                'width': right - left,
-                'height': bottom - top,
-                'monitor_relative_x': left,
-                'monitor_relative_y': top
-            }
-        except Exception:
-            return None 
\ No newline at end of file
+    # Sort by length
+    vertical_lines.sort(key=lambda x: x[3], reverse=True)
+    
+    if len(vertical_lines) < 3:  # Need at least 3 vertical lines
+        return None
+        
+    # Find window bounds
+    try:
+        top = min(l[0] for l in horizontal_lines[:2])  # Use top 2 horizontal lines
+        bottom = max(l[0] for l in horizontal_lines[:5])  # Use top 5 for bottom
+        left = min(l[0] for l in vertical_lines[:3])  # Use leftmost 3 vertical lines
+        right = max(l[0] for l in vertical_lines[:3])  # Use rightmost 3 vertical lines
+        return _bounds_dict(left, top, right, bottom)
+    except Exception:
+        return None 
+
+def _profile_peaks(profile, count, min_value, radius):
+    """Indices of the `count` highest values >= min_value, at least `radius` apart."""
+    profile = profile.astype(np.int64)
+    peaks = []
+    while len(peaks) < count:
+        i = int(np.argmax(profile))
+        if profile[i] < min_value:
+            break
+        peaks.append(i)
+        profile[max(0, i - radius):i + radius + 1] = -1
+    return peaks
+
+def _refine(gray, position, scale, span, axis):
+    """Move a coarse line position to the full-resolution row/column with the most edge pixels."""
+    start = max(0, position * scale - scale)
+    stop = min(gray.shape[axis], position * scale + scale + 1)
+    lo, hi = span
+    band = gray[start:stop, lo:hi] if axis == 0 else gray[lo:hi, start:stop]
+    if band.size == 0:
+        return position * scale
+    counts = np.count_nonzero(cv2.Canny(band, CANNY_LOW, CANNY_HIGH), axis=1 - axis)
+    return start + int(np.argmax(counts))
+
+def projection_bounds(ctx, level=1, min_length=50, peak_radius=2, refine=True):
+    """Bounds from edge projection profiles over a 1/2**level scale image.
+    
+    An integral image of the reduced edge map gives edge counts for any row or
+    column span in O(1). The column profile picks left/right, then the row
+    profile is taken only between them (and vice versa for the column pass),
+    choosing lines the same way as edge_run_bounds. With `refine`, each line
+    is snapped to full resolution by running Canny on a narrow band.
+    """
+    scale = 2 ** level
+    table = ctx.edge_integral(CANNY_LOW, CANNY_HIGH, level)
+    height, width = table.shape[0] - 1, table.shape[1] - 1
+    min_count = max(1, min_length // scale)
+    
+    def row_profile(x0, x1):
+        return (table[1:, x1] - table[:-1, x1]) - (table[1:, x0] - table[:-1, x0])
+    
+    def col_profile(y0, y1):
+        return (table[y1, 1:] - table[y1, :-1]) - (table[y0, 1:] - table[y0, :-1])
+    
+    # First pass over the whole frame, second pass limited to the first-pass span
+    cols = _profile_peaks(col_profile(0, height), 3, min_count, peak_radius)
+    rows = _profile_peaks(row_profile(0, width), 5, min_count, peak_radius)
+    if len(rows) < 5 or len(cols) < 3:
+        return None
+    left, right = min(cols), max(cols)
+    top, bottom = min(rows[:2]), max(rows)
+    if right > left and bottom > top:
+        rows = _profile_peaks(row_profile(left, right + 1), 5, min_count, peak_radius) or rows
+        cols = _profile_peaks(col_profile(top, bottom + 1), 3, min_count, peak_radius) or cols
+        left, right = min(cols), max(cols)
+        top, bottom = min(rows[:2]), max(rows)
+    
+    if not refine or scale == 1:
+        return _bounds_dict(left * scale, top * scale, right * scale, bottom * scale)
+    gray = ctx.gray()
+    x_span = (left * scale, right * scale + 1)
+    y_span = (top * scale, bottom * scale + 1)
+    return _bounds_dict(
+        _refine(gray, left, scale, y_span, axis=1),
+        _refine(gray, top, scale, x_span, axis=0),
+        _refine(gray, right, scale, y_span, axis=1),
+        _refine(gray, bottom, scale, x_span, axis=0),
+    )
+
+# Strategy name -> function(ctx, **options) returning the bounds dict or None
+STRATEGIES = {
+    "edges": edge_run_bounds,
+    "projection": projection_bounds,
+}
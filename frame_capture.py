@@ -0,0 +1,112 @@
+"""
+Screen capture without intermediate full-frame copies.
+
+`np.array(screenshot)` copies the whole BGRA frame before any conversion runs,
+and slicing channels with `img[:, :, [2, 1, 0]]` copies it again. Frame wraps
+the mss `raw` buffer as a read-only view instead and converts into buffers the
+grabber reuses across frames, so each representation costs one conversion.
+"""
+import cv2
+import mss
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+# Converted representations: name -> (cvtColor code, channels)
+CONVERSIONS = {
+    "gray": (cv2.COLOR_BGRA2GRAY, 1),
+    "bgr": (cv2.COLOR_BGRA2BGR, 3),
+    "rgb": (cv2.COLOR_BGRA2RGB, 3),
+}
+
+CHANNELS = {"b": 0, "g": 1, "r": 2, "a": 3}
+
+class FrameBuffers:
+    """Output arrays reused between frames, keyed by representation and shape."""
+
+    def __init__(self):
+        self._buffers: Dict[Tuple[str, Tuple[int, ...]], np.ndarray] = {}
+
+    def get(self, name: str, shape: Tuple[int, ...]) -> np.ndarray:
+        key = (name, shape)
+        buffer = self._buffers.get(key)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=np.uint8)
+            self._buffers[key] = buffer
+        return buffer
+
+    def clear(self):
+        self._buffers.clear()
+
+class Frame:
+    """One mss screenshot viewed as a (height, width, 4) BGRA array.
+
+    Converted images are computed at most once per frame. They are written into
+    the shared FrameBuffers, so they stay valid only until the next frame of the
+    same size is converted; call .copy() on anything that must outlive it.
+    """
+
+    def __init__(self, screenshot, buffers: Optional[FrameBuffers] = None):
+        self.screenshot = screenshot
+        self.left = screenshot.left
+        self.top = screenshot.top
+        self.width = screenshot.width
+        self.height = screenshot.height
+        self.bgra = np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(self.height, self.width, 4)
+        self.bgra.setflags(write=False)
+        self.buffers = buffers or FrameBuffers()
+        self._converted: Dict[str, np.ndarray] = {}
+
+    @property
+    def shape(self) -> Tuple[int, int, int]:
+        return self.bgra.shape
+
+    def _convert(self, name: str) -> np.ndarray:
+        image = self._converted.get(name)
+        if image is None:
+            code, channels = CONVERSIONS[name]
+            shape = (self.height, self.width) if channels == 1 else (self.height, self.width, channels)
+            image = cv2.cvtColor(self.bgra, code, dst=self.buffers.get(name, shape))
+            self._converted[name] = image
+        return image
+
+    def gray(self) -> np.ndarray:
+        return self._convert("gray")
+
+    def bgr(self) -> np.ndarray:
+        return self._convert("bgr")
+
+    def rgb(self) -> np.ndarray:
+        return self._convert("rgb")
+
+    def channel(self, name: str) -> np.ndarray:
+        """Strided view of one channel ("b", "g", "r" or "a"); no conversion or copy."""
+        return self.bgra[:, :, CHANNELS[name]]
+
+    def color(self) -> np.ndarray:
+        """BGR view that skips the alpha channel; no conversion or copy, but not contiguous."""
+        return self.bgra[:, :, :3]
+
+class FrameGrabber:
+    """Grab mss regions as Frames that share one set of conversion buffers.
+
+    Pass an existing mss handle to reuse it; otherwise one is opened and closed
+    with the grabber. mss handles must stay on the thread that created them.
+    """
+
+    def __init__(self, sct=None):
+        self._owns_sct = sct is None
+        self.sct = sct or mss.mss()
+        self.buffers = FrameBuffers()
+
+    def grab(self, region) -> Frame:
+        return Frame(self.sct.grab(region), self.buffers)
+
+    def close(self):
+        if self._owns_sct:
+            self.sct.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
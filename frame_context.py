@@ -0,0 +1,119 @@
+"""
+Derived images shared by every detector that looks at the same frame.
+
+Window bounds, the contrast line and the Accept button scan all start from
+the same capture. A FrameContext computes gray, thresholds, Canny maps,
+pyramids and integral images on first request and returns the memoized
+result afterwards, so each product is computed at most once per frame.
+Detectors with products of their own (ImageMatcher's match domains) memoize
+them on the same context through memo(), so several matchers looking at one
+frame share them too.
+"""
+import cv2
+import numpy as np
+from typing import Callable, Dict, Hashable, Optional, Tuple
+from frame_capture import Frame
+
+# (x, y, width, height) in frame coordinates
+Region = Tuple[int, int, int, int]
+
+class FrameContext:
+    """Lazily computed products of one frame.
+
+    Accepts a frame_capture.Frame or a BGR(A), RGB(A) or grayscale array;
+    `color_order` is "rgb" for PIL and pyautogui captures. Products are treated
+    as read-only; copy before drawing on them.
+    """
+
+    def __init__(self, frame, color_order: str = "bgr"):
+        if isinstance(frame, Frame):
+            self.frame = frame
+            self.image = frame.bgra
+            color_order = "bgr"
+        else:
+            self.frame = None
+            self.image = np.asarray(frame)
+        if color_order not in ("bgr", "rgb"):
+            raise ValueError(f"Unknown color order '{color_order}', expected 'bgr' or 'rgb'")
+        self.color_order = color_order
+        self.height, self.width = self.image.shape[:2]
+        self._products: Dict[Hashable, np.ndarray] = {}
+        self.computed = 0  # Products computed (not served from the memo)
+
+    def memo(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """Product `key` of this frame, computed by `compute()` on first request.
+
+        Namespace keys of detector-specific products, e.g. ("match", "edge").
+        """
+        product = self._products.get(key)
+        if product is None:
+            product = compute()
+            self._products[key] = product
+            self.computed += 1
+        return product
+
+    def _crop(self, image: np.ndarray, roi: Optional[Region]) -> np.ndarray:
+        if roi is None:
+            return image
+        x, y, w, h = roi
+        return image[y:y + h, x:x + w]
+
+    def bgr(self) -> np.ndarray:
+        return self.memo("bgr", self._compute_bgr)
+
+    def _compute_bgr(self) -> np.ndarray:
+        if self.frame is not None:
+            return self.frame.bgr()
+        if self.image.ndim == 2:
+            return cv2.cvtColor(self.image, cv2.COLOR_GRAY2BGR)
+        rgb = self.color_order == "rgb"
+        if self.image.shape[2] == 4:
+            return cv2.cvtColor(self.image, cv2.COLOR_RGBA2BGR if rgb else cv2.COLOR_BGRA2BGR)
+        return cv2.cvtColor(self.image, cv2.COLOR_RGB2BGR) if rgb else self.image
+
+    def gray(self) -> np.ndarray:
+        return self.memo("gray", self._compute_gray)
+
+    def _compute_gray(self) -> np.ndarray:
+        if self.frame is not None:
+            return self.frame.gray()
+        if self.image.ndim == 2:
+            return self.image
+        rgb = self.color_order == "rgb"
+        if self.image.shape[2] == 4:
+            code = cv2.COLOR_RGBA2GRAY if rgb else cv2.COLOR_BGRA2GRAY
+        else:
+            code = cv2.COLOR_RGB2GRAY if rgb else cv2.COLOR_BGR2GRAY
+        return cv2.cvtColor(self.image, code)
+
+    def threshold(self, level: int, maxval: int = 255, inverse: bool = False,
+                  roi: Optional[Region] = None) -> np.ndarray:
+        """Binary mask of gray > level, over the whole frame or just `roi`."""
+        def compute():
+            kind = cv2.THRESH_BINARY_INV if inverse else cv2.THRESH_BINARY
+            return cv2.threshold(self._crop(self.gray(), roi), level, maxval, kind)[1]
+        return self.memo(("threshold", level, maxval, inverse, roi), compute)
+
+    def canny(self, low: int, high: int, level: int = 0) -> np.ndarray:
+        """Canny edges of the gray pyramid level (level 0 is full resolution)."""
+        return self.memo(("canny", low, high, level), lambda: cv2.Canny(self.pyramid(level), low, high))
+
+    def pyramid(self, level: int) -> np.ndarray:
+        """Gray image reduced `level` times by pyrDown; level 0 is gray itself."""
+        if level == 0:
+            return self.gray()
+        return self.memo(("pyramid", level), lambda: cv2.pyrDown(self.pyramid(level - 1)))
+
+    def edge_integral(self, low: int, high: int, level: int = 0) -> np.ndarray:
+        """Summed-area table of canny(low, high, level) as 0/1, shape (h + 1, w + 1).
+
+        Gives the edge count of any rectangle (or row/column span) in O(1).
+        """
+        def compute():
+            return cv2.integral((self.canny(low, high, level) > 0).astype(np.uint8))
+        return self.memo(("edge_integral", low, high, level), compute)
+
+    def clahe(self, clip_limit: float = 2.0, tile_grid: Tuple[int, int] = (8, 8)) -> np.ndarray:
+        def compute():
+            return cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=tile_grid).apply(self.gray())
+        return self.memo(("clahe", clip_limit, tile_grid), compute)
@@ -0,0 +1,53 @@
+"""
+Enumerate monitors and key their layout for the Cursor monitor finders.
+
+A long-lived mss handle keeps the monitor list it started with, so displays
+added, removed or rearranged later only show up through a newly opened
+handle. MonitorLayout reopens its handle at most every `refresh_interval`
+seconds (0 reopens on every call) and hands that same handle back for
+grabbing, so the layout and the captures taken against it always agree.
+mss handles are not shareable across threads, so each thread gets its own.
+"""
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+import mss
+from mss.base import MSSBase
+
+Layout = Tuple[Tuple[int, int, int, int], ...]
+
+def layout_key(monitors: List[Dict]) -> Layout:
+    """(left, top, width, height) of every monitor; changes when the layout does."""
+    return tuple((m['left'], m['top'], m['width'], m['height']) for m in monitors)
+
+class MonitorLayout:
+    """Per-thread mss handle with the monitor list it was opened with."""
+
+    def __init__(self, refresh_interval: float = 0.0, clock: Callable[[], float] = time.monotonic):
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self._local = threading.local()
+        self.enumerations = 0
+
+    def current(self, refresh: bool = False) -> Tuple[MSSBase, List[Dict], Layout]:
+        """This thread's handle, its monitors (without the combined entry 0) and their layout key.
+
+        refresh=True reopens the handle even if refresh_interval has not passed.
+        """
+        state = self._local
+        now = self.clock()
+        if refresh or getattr(state, 'sct', None) is None or now - state.opened_at >= self.refresh_interval:
+            self._reopen(state, now)
+        return state.sct, state.monitors, state.layout
+
+    def _reopen(self, state, now: float):
+        if getattr(state, 'sct', None) is not None:
+            state.sct.close()
+        sct = mss.mss()
+        state.sct = sct
+        state.monitors = [dict(m) for m in sct.monitors[1:]]
+        state.layout = layout_key(state.monitors)
+        state.opened_at = now
+        self.enumerations += 1
+
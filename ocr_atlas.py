@@ -0,0 +1,113 @@
+"""
+Recognize many small crops with one tesseract run.
+
+Every pytesseract call starts a tesseract process, which costs far more than
+reading a button label. The atlas stacks a frame's candidate crops into one
+padded image, remembering where each one landed. It runs image_to_data once and
+assigns every recognized word back to the crop its box falls in. Crops are
+stacked vertically, so words from different crops never share a text line.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import cv2
+import numpy as np
+import pytesseract
+from pytesseract import Output
+
+# Sparse text: find words anywhere in the atlas, in no particular layout
+ATLAS_CONFIG = '--psm 11'
+
+@dataclass
+class AtlasSlot:
+    """Where one crop sits in an atlas."""
+    index: int        # Position in the list of crops passed in
+    x: int
+    y: int
+    width: int
+    height: int
+
+    def contains(self, cx: int, cy: int) -> bool:
+        return self.x <= cx < self.x + self.width and self.y <= cy < self.y + self.height
+
+def _as_gray(crop: np.ndarray) -> np.ndarray:
+    if crop.ndim == 2:
+        return crop
+    if crop.shape[2] == 4:
+        return cv2.cvtColor(crop, cv2.COLOR_BGRA2GRAY)
+    return cv2.cvtColor(crop, cv2.COLOR_RGB2GRAY)
+
+def pack_atlas(crops: Sequence[np.ndarray], pad: int = 16, background: int = 0):
+    """Stack crops top to bottom with `pad` pixels of background around each.
+
+    Returns (atlas, slots). Channel order does not matter for masks; colour
+    crops are treated as RGB.
+    """
+    grays = [_as_gray(crop) for crop in crops]
+    width = max(g.shape[1] for g in grays) + 2 * pad
+    height = sum(g.shape[0] for g in grays) + pad * (len(grays) + 1)
+    atlas = np.full((height, width), background, dtype=np.uint8)
+
+    slots = []
+    y = pad
+    for index, gray in enumerate(grays):
+        h, w = gray.shape
+        atlas[y:y + h, pad:pad + w] = gray
+        slots.append(AtlasSlot(index, pad, y, w, h))
+        y += h + pad
+    return atlas, slots
+
+def _read_atlas(atlas: np.ndarray, slots: List[AtlasSlot], config: str, texts: Dict[int, List[List[str]]]):
+    data = pytesseract.image_to_data(atlas, config=config, output_type=Output.DICT)
+    ys = [slot.y for slot in slots]
+    line_keys: Dict[int, tuple] = {}
+    for i, word in enumerate(data['text']):
+        word = word.strip()
+        if not word or float(data['conf'][i]) < 0:
+            continue
+        cx = data['left'][i] + data['width'][i] // 2
+        cy = data['top'][i] + data['height'][i] // 2
+        # Slots are in y order; the last one starting above the word's centre is the only candidate
+        pos = int(np.searchsorted(ys, cy, side='right')) - 1
+        if pos < 0 or not slots[pos].contains(cx, cy):
+            continue  # Noise in the padding
+        slot = slots[pos]
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        lines = texts.setdefault(slot.index, [])
+        if line_keys.get(slot.index) != key:
+            line_keys[slot.index] = key
+            lines.append([])
+        lines[-1].append(word)
+
+def batch_ocr(crops: Sequence[np.ndarray], config: str = ATLAS_CONFIG, pad: int = 16,
+              background: int = 0, max_height: int = 16000) -> List[str]:
+    """Text of each crop, in order, from as few tesseract runs as possible.
+
+    Crops are split across several atlases only when one would grow past
+    `max_height` pixels. Lines within a crop are joined with newlines, as
+    image_to_string returns them.
+    """
+    if not crops:
+        return []
+
+    texts: Dict[int, List[List[str]]] = {}
+    batch: List[np.ndarray] = []
+    batch_start = 0
+    batch_height = pad
+    for index, crop in enumerate(crops):
+        crop_height = crop.shape[0] + pad
+        if batch and batch_height + crop_height > max_height:
+            atlas, slots = pack_atlas(batch, pad, background)
+            for slot in slots:
+                slot.index += batch_start
+            _read_atlas(atlas, slots, config, texts)
+            batch, batch_start, batch_height = [], index, pad
+        batch.append(crop)
+        batch_height += crop_height
+
+    atlas, slots = pack_atlas(batch, pad, background)
+    for slot in slots:
+        slot.index += batch_start
+    _read_atlas(atlas, slots, config, texts)
+
+    return ['\n'.join(' '.join(words) for words in texts.get(i, [])) for i in range(len(crops))]
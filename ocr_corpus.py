@@ -0,0 +1,106 @@
+"""
+Labeled region crops for tuning and benchmarking OCR offline.
+
+A corpus is a directory of crops plus a manifest.json next to them:
+
+    {"crops": [{"image": "accept_01.png", "text": "Accept", "button": true},
+               {"image": "reject_01.png", "text": "Reject", "button": false}]}
+
+`text` is what the crop should read as and `button` whether it is an Accept
+button the bot should click. Image paths are relative to the manifest.
+
+Raw region crops saved by `test_accept_monitor.py --collect-corpus`
+(corpus_region_*.png) can be gathered into a corpus for labelling:
+
+    python ocr_corpus.py corpus/ "corpus_region_*.png"
+
+Crops must be unprocessed: the optimizer and benchmark apply the OCR profile's
+scaling, padding and binarization themselves. Already-binarized images such as
+debug_merged_region_*.png are rejected.
+"""
+import argparse
+import glob
+import json
+import logging
+import os
+import shutil
+from dataclasses import dataclass
+from typing import List
+
+import cv2
+import numpy as np
+
+@dataclass
+class CorpusCrop:
+    path: str
+    text: str
+    button: bool
+
+    def load(self) -> np.ndarray:
+        image = cv2.imread(self.path)
+        if image is None:
+            raise FileNotFoundError(f"Could not read corpus crop {self.path}")
+        return image
+
+def load_corpus(manifest_path: str) -> List[CorpusCrop]:
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    base = os.path.dirname(os.path.abspath(manifest_path))
+    return [CorpusCrop(os.path.join(base, c["image"]), c.get("text", ""), bool(c.get("button", False)))
+            for c in manifest["crops"]]
+
+def accept_match_score(text: str) -> int:
+    """Characters of "Accept" found in order in any casing of `text`, as monitor_accept_button scores it."""
+    score = 0
+    target = "Accept"
+    if text:
+        for variant in [text, text.lower(), text.upper(), text.title()]:
+            temp_score = 0
+            last_pos = -1
+            for c in variant:
+                if last_pos + 1 < len(target) and c == target[last_pos + 1]:
+                    temp_score += 1
+                    last_pos += 1
+            score = max(score, temp_score)
+    return score
+
+def is_binarized(image: np.ndarray) -> bool:
+    """True for images that only hold black and white, i.e. crops that were already preprocessed."""
+    return bool(np.isin(image, (0, 255)).all())
+
+def collect_crops(patterns: List[str], corpus_dir: str) -> str:
+    """Copy raw crops matching the glob patterns into corpus_dir and add them unlabeled to its manifest."""
+    os.makedirs(corpus_dir, exist_ok=True)
+    manifest_path = os.path.join(corpus_dir, "manifest.json")
+    manifest = {"crops": []}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+    known = {c["image"] for c in manifest["crops"]}
+
+    for path in sorted(p for pattern in patterns for p in glob.glob(pattern)):
+        name = os.path.basename(path)
+        if name in known:
+            continue
+        image = cv2.imread(path)
+        if image is None or is_binarized(image):
+            logging.warning(f"Skipping {path}: not a raw colour crop (already preprocessed or unreadable)")
+            continue
+        shutil.copy2(path, os.path.join(corpus_dir, name))
+        manifest["crops"].append({"image": name, "text": "", "button": False})
+        known.add(name)
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+    return manifest_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Gather raw region crops into an OCR corpus")
+    parser.add_argument("corpus_dir", help="Corpus directory (manifest.json is created or extended)")
+    parser.add_argument("patterns", nargs="+", help="Glob patterns of crops to add")
+    args = parser.parse_args()
+    manifest_path = collect_crops(args.patterns, args.corpus_dir)
+    print(f"Updated {manifest_path}; fill in 'text' and 'button' for the new crops")
+
+if __name__ == "__main__":
+    main()
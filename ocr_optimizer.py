@@ -1,9 +1,44 @@
+"""
+Find the best OCR settings for the Accept button.
+
+    python ocr_optimizer.py                      # try 4 methods x 4 PSMs on a live capture
+    python ocr_optimizer.py --corpus manifest.json [--workers 8]
+
+With a corpus (see ocr_corpus.py) the full grid of preprocessing methods,
+scale factors, thresholds, PSM and OEM modes is evaluated in a process pool.
+Accuracy and per-crop latency are recorded for every configuration, and the
+Pareto-optimal ones are written to ocr_profile.json, which
+monitor_accept_button loads at startup.
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import os
 import mss
 import numpy as np
 import cv2
 import pytesseract
 import time
 from datetime import datetime
+from typing import Dict, List, Optional
+
+from ocr_corpus import accept_match_score, load_corpus
+
+OCR_PROFILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ocr_profile.json')
+
+# What monitor_accept_button used before profiles existed
+DEFAULT_OCR_PROFILE = {'method': 'threshold', 'scale': 16, 'threshold': 200, 'psm': 8, 'oem': 1}
+
+# Grid searched in corpus mode
+GRID_METHODS = ['threshold', 'contrast', 'sharpen', 'adaptive']
+GRID_SCALES = [4, 8, 12, 16]
+GRID_THRESHOLDS = [160, 180, 200, 220]
+GRID_PSMS = [7, 8, 13]
+GRID_OEMS = [1, 3]
+
+# Accept match score at which a crop counts as an Accept button
+BUTTON_SCORE = 2
 
 def log(message):
     """Print timestamped log message"""
@@ -26,16 +61,7 @@ def try_ocr_method(img, method_name, preprocess_func):
         text = pytesseract.image_to_string(processed, config=config).strip()
         if text:
             # Calculate match score
-            score = 0
-            target = "Accept"
-            for variant in [text, text.lower(), text.upper(), text.title()]:
-                temp_score = 0
-                last_pos = -1
-                for c in variant:
-                    if last_pos + 1 < len(target) and c == target[last_pos + 1]:
-                        temp_score += 1
-                        last_pos += 1
-                score = max(score, temp_score)
+            score = accept_match_score(text)
             
             results.append({
                 'method': method_name,
@@ -92,7 +118,8 @@ def method4(img):
         gray = scaled
     return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
 
-def main():
+def optimize_live():
+    """Try each method and PSM on one live capture and print the results"""
     log("Starting OCR optimization...")
     
     with mss.mss() as sct:
@@ -143,5 +170,146 @@ def main():
             log(f"Debug file: {r['debug_file']}")
             log("---")
 
+def preprocess(img, profile):
+    """Scale, grayscale, pad and binarize a region crop as described by an OCR profile"""
+    scale = profile['scale']
+    scaled = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    if len(scaled.shape) == 3:
+        scaled = cv2.cvtColor(scaled, cv2.COLOR_BGR2GRAY)
+    
+    # Pad so glyphs don't touch the border
+    pad_x = 20 * scale
+    pad_y = 10 * scale
+    padded = cv2.copyMakeBorder(scaled, pad_y, pad_y, pad_x, pad_x, cv2.BORDER_CONSTANT, value=255)
+    
+    method = profile['method']
+    if method == 'adaptive':
+        return cv2.adaptiveThreshold(padded, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    if method == 'contrast':
+        padded = cv2.convertScaleAbs(padded, alpha=1.5, beta=0)
+    elif method == 'sharpen':
+        kernel = np.array([[-1,-1,-1], [-1,9,-1], [-1,-1,-1]])
+        padded = cv2.filter2D(padded, -1, kernel)
+    elif method != 'threshold':
+        raise ValueError(f"Unknown OCR preprocessing method '{method}'")
+    return cv2.threshold(padded, profile['threshold'], 255, cv2.THRESH_BINARY)[1]
+
+def tesseract_config(profile):
+    return f"--psm {profile['psm']} --oem {profile['oem']}"
+
+def load_ocr_profile(path=OCR_PROFILE_PATH):
+    """The chosen profile from ocr_profile.json, or the built-in default if there is none"""
+    try:
+        with open(path, 'r') as f:
+            profile = dict(DEFAULT_OCR_PROFILE, **json.load(f)['profile'])
+        log(f"Loaded OCR profile from {path}: {profile}")
+        return profile
+    except FileNotFoundError:
+        return dict(DEFAULT_OCR_PROFILE)
+    except (ValueError, KeyError) as e:
+        log(f"Ignoring invalid OCR profile {path}: {str(e)}")
+        return dict(DEFAULT_OCR_PROFILE)
+
+def grid_profiles():
+    """Every profile in the search grid; adaptive thresholding has no threshold to vary"""
+    for method, scale, psm, oem in itertools.product(GRID_METHODS, GRID_SCALES, GRID_PSMS, GRID_OEMS):
+        thresholds = [None] if method == 'adaptive' else GRID_THRESHOLDS
+        for threshold in thresholds:
+            yield {'method': method, 'scale': scale, 'threshold': threshold, 'psm': psm, 'oem': oem}
+
+def evaluate_profile(job):
+    """Run one profile over every corpus crop; executed in a worker process"""
+    profile, crops = job
+    if not crops:
+        raise ValueError("Nothing to evaluate: the corpus has no crops")
+    latencies = []
+    text_hits = 0
+    true_pos = false_pos = false_neg = true_neg = 0
+    for crop in crops:
+        image = crop.load()
+        start = time.perf_counter()
+        text = pytesseract.image_to_string(preprocess(image, profile), config=tesseract_config(profile)).strip()
+        latencies.append((time.perf_counter() - start) * 1000)
+        
+        text_hits += text.lower() == crop.text.lower()
+        predicted = accept_match_score(text) >= BUTTON_SCORE
+        if predicted and crop.button:
+            true_pos += 1
+        elif predicted:
+            false_pos += 1
+        elif crop.button:
+            false_neg += 1
+        else:
+            true_neg += 1
+    
+    p50, p95 = np.percentile(latencies, [50, 95])
+    return {
+        'profile': profile,
+        'accuracy': (true_pos + true_neg) / len(crops),
+        'text_accuracy': text_hits / len(crops),
+        'precision': true_pos / (true_pos + false_pos) if true_pos + false_pos else 0.0,
+        'recall': true_pos / (true_pos + false_neg) if true_pos + false_neg else 0.0,
+        'latency_ms': {'p50': float(p50), 'p95': float(p95), 'mean': float(np.mean(latencies))},
+    }
+
+def pareto_front(results):
+    """Results not beaten on both button accuracy and median latency by any other result"""
+    front = []
+    for r in sorted(results, key=lambda r: (-r['accuracy'], r['latency_ms']['p50'])):
+        if not front or r['latency_ms']['p50'] < front[-1]['latency_ms']['p50']:
+            front.append(r)
+    return front
+
+def optimize_corpus(manifest_path, workers=None, output=OCR_PROFILE_PATH):
+    """Grid-search OCR profiles over a labeled corpus and write the Pareto front as the runtime profile"""
+    crops = load_corpus(manifest_path)
+    if not crops:
+        log(f"Error: corpus {manifest_path} has no crops; keeping the existing OCR profile")
+        return None
+    profiles = list(grid_profiles())
+    log(f"Evaluating {len(profiles)} OCR profiles on {len(crops)} crops")
+    
+    results = []
+    with multiprocessing.Pool(processes=workers) as pool:
+        for i, result in enumerate(pool.imap_unordered(evaluate_profile, [(p, crops) for p in profiles]), 1):
+            results.append(result)
+            if i % 50 == 0:
+                log(f"  {i}/{len(profiles)} profiles evaluated")
+    
+    front = pareto_front(results)
+    if not front:
+        log("Error: no OCR profile was evaluated; keeping the existing OCR profile")
+        return None
+    log("\nPareto front (accuracy vs p50 latency):")
+    for r in front:
+        log(f"  {r['profile']}: accuracy {r['accuracy']:.0%}, precision {r['precision']:.0%}, "
+            f"recall {r['recall']:.0%}, p50 {r['latency_ms']['p50']:.1f}ms")
+    
+    report = {
+        'generated': datetime.now().isoformat(timespec='seconds'),
+        'corpus': os.path.abspath(manifest_path),
+        'crops': len(crops),
+        # Most accurate profile, fastest among ties
+        'profile': front[0]['profile'],
+        'pareto': front,
+        'results': sorted(results, key=lambda r: (-r['accuracy'], r['latency_ms']['p50'])),
+    }
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=4)
+    log(f"Saved OCR profile: {output}")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Find the best OCR settings for the Accept button")
+    parser.add_argument("--corpus", help="Corpus manifest JSON; omit to try methods on a live capture")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--output", default=OCR_PROFILE_PATH, help="Where to write the OCR profile")
+    args = parser.parse_args()
+    
+    if args.corpus:
+        optimize_corpus(args.corpus, args.workers, args.output)
+    else:
+        optimize_live()
+
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Pink underline detection shared by cursor_finder and the v3 archive.
+
+Cursor marks the active composer tab with a thin pink line. The detector
+thresholds the BGRA capture with one cv2.inRange call and reads every
+component's bounding box from a single connectedComponentsWithStats pass,
+instead of labelling the mask and comparing it against each label in turn.
+"""
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+# BGR colour boxes (lower, upper), inclusive
+PINK_LOOSE = ((150, 80, 200), (220, 160, 255))   # Any pink-ish pixel
+PINK_EXACT = ((193, 115, 245), (203, 125, 255))  # (251, 120, 198) RGB with anti-aliasing tolerance
+
+@dataclass
+class LineCandidate:
+    """One pink component, in image coordinates."""
+    x: int
+    y: int
+    width: int
+    height: int
+    area: int                    # Pink pixels in the component
+    center: Tuple[int, int]      # Centroid
+
+    @property
+    def fill(self) -> float:
+        """Fraction of the bounding box that is pink; near 1 for a clean line."""
+        return self.area / (self.width * self.height)
+
+class PinkLineDetector:
+    """Rank horizontal pink lines in a BGR or BGRA image."""
+
+    def __init__(self, color_range=PINK_EXACT, min_width: int = 10, max_height: int = 3):
+        self.lower = np.array(color_range[0], dtype=np.uint8)
+        self.upper = np.array(color_range[1], dtype=np.uint8)
+        self.min_width = min_width
+        self.max_height = max_height
+
+    def mask(self, img: np.ndarray) -> np.ndarray:
+        if img.shape[2] == 4:
+            # Threshold the capture as-is; alpha is unconstrained
+            return cv2.inRange(img, np.append(self.lower, 0), np.append(self.upper, 255))
+        return cv2.inRange(img, self.lower, self.upper)
+
+    def find_lines(self, img: np.ndarray) -> List[LineCandidate]:
+        """Line-shaped pink components, widest first (rightmost on ties)."""
+        count, _, stats, centroids = cv2.connectedComponentsWithStats(self.mask(img), connectivity=8)
+        lines = []
+        for label in range(1, count):
+            x, y, w, h, area = (int(v) for v in stats[label])
+            if w >= self.min_width and h <= self.max_height:
+                cx, cy = centroids[label]
+                lines.append(LineCandidate(x, y, w, h, area, (int(cx), int(cy))))
+        lines.sort(key=lambda line: (-line.width, -(line.x + line.width)))
+        return lines
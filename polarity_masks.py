@@ -0,0 +1,60 @@
+"""
+Light-text and dark-text masks from one pass over a capture.
+
+A pixel is light text when its darkest channel is at or above the light level,
+and dark text when its brightest channel is at or below the dark level. The
+usual np.all(img >= [l, l, l], axis=2) form builds a boolean cube, reduces it
+and then paints a zeros_like RGB image, separately for each polarity. Here the
+per-pixel min and max channels are reduced in place into preallocated uint8
+planes. A 256-entry lookup table then maps each plane straight to a 0/255 mask.
+
+The returned masks are the detector's own buffers and are overwritten by the
+next call. Copy them if they must outlive the frame.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+def _level_lut(predicate) -> np.ndarray:
+    return np.where(predicate(np.arange(256)), 255, 0).astype(np.uint8)
+
+class PolarityMasks:
+    """Reusable light/dark text mask generator for RGB, BGR or BGRA images."""
+
+    def __init__(self, light_level: int = 200, dark_level: int = 50):
+        self.light_level = light_level
+        self.dark_level = dark_level
+        self._light_lut = _level_lut(lambda v: v >= light_level)
+        self._dark_lut = _level_lut(lambda v: v <= dark_level)
+        self._shape: Optional[Tuple[int, int]] = None
+
+    def _buffers(self, shape: Tuple[int, int]):
+        if shape != self._shape:
+            self._shape = shape
+            self._min = np.empty(shape, dtype=np.uint8)
+            self._max = np.empty(shape, dtype=np.uint8)
+            self._light = np.empty(shape, dtype=np.uint8)
+            self._dark = np.empty(shape, dtype=np.uint8)
+
+    def light(self, img: np.ndarray) -> np.ndarray:
+        """255 where every colour channel is >= light_level (light text on dark)."""
+        self._buffers(img.shape[:2])
+        np.minimum(img[:, :, 0], img[:, :, 1], out=self._min)
+        np.minimum(self._min, img[:, :, 2], out=self._min)
+        return cv2.LUT(self._min, self._light_lut, dst=self._light)
+
+    def dark(self, img: np.ndarray) -> np.ndarray:
+        """255 where every colour channel is <= dark_level (dark text on light)."""
+        self._buffers(img.shape[:2])
+        np.maximum(img[:, :, 0], img[:, :, 1], out=self._max)
+        np.maximum(self._max, img[:, :, 2], out=self._max)
+        return cv2.LUT(self._max, self._dark_lut, dst=self._dark)
+
+    def masks(self, img: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(light, dark) masks of the same image."""
+        return self.light(img), self.dark(img)
+
+    def select(self, img: np.ndarray, polarities: Sequence[str]) -> List[Tuple[str, np.ndarray]]:
+        """(polarity, mask) for only the named polarities, "light" and/or "dark"."""
+        return [(polarity, self.light(img) if polarity == "light" else self.dark(img)) for polarity in polarities]
@@ -2,7 +2,6 @@
 import subprocess
 import sys
 import time
-import json
 import os
 import signal
 from PyQt5.QtWidgets import QApplication, QWidget, QLabel
@@ -10,12 +9,20 @@ from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPainter, QPen, QColor
 import pyautogui
 
+from config_service import ConfigService, require_keys
+
 class AutomationController:
     def __init__(self):
         self.composer_process = None
         self.app = QApplication(sys.argv)
         self.status_window = None
         self.config_file = 'clickbot_v2/config.json'
+        # Loaded once and reloaded in the background when calibration rewrites the file
+        self.config_service = ConfigService(self.config_file, require_keys(
+            'accept_button.x', 'accept_button.y',
+            'composer_area.top_left.x', 'composer_area.top_left.y',
+            'composer_area.bottom_right.x', 'composer_area.bottom_right.y'))
+        self.config_service.subscribe(self.on_config_change)
         
     def start_composer(self):
         print("🚀 Starting composer...")
@@ -53,11 +60,13 @@ class AutomationController:
             }
         }
         
-        os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
-        with open(self.config_file, 'w') as f:
-            json.dump(config, f, indent=4)
+        self.config_service.save(config)
         print("\n💾 Configuration saved!")
         
+    def on_config_change(self, old, new):
+        if old is not None:
+            print("🔄 Configuration reloaded")
+        
     def show_status_window(self):
         if not self.status_window:
             self.status_window = StatusWindow()
@@ -72,13 +81,13 @@ class AutomationController:
     def start_monitoring(self):
         print("\n👀 Starting accept button monitoring...")
         self.show_status_window()
+        self.config_service.start()
         
         try:
             while True:
-                try:
-                    with open(self.config_file, 'r') as f:
-                        config = json.load(f)
-                except FileNotFoundError:
+                # In-memory copy; the service swaps in a new one when the file changes
+                config = self.config_service.config
+                if config is None:
                     print("❌ Configuration not found. Starting calibration...")
                     self.calibrate_clickbot()
                     continue
@@ -99,6 +108,7 @@ class AutomationController:
                 
         except KeyboardInterrupt:
             print("\n👋 Stopping automation...")
+            self.config_service.stop()
             if self.composer_process:
                 self.composer_process.terminate()
             if self.status_window:
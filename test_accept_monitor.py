@@ -1,20 +1,39 @@
 import mss
+import sys
 import numpy as np
 import cv2
 import pytesseract
 import time
 import pyautogui
-from fast_window_finder import find_window_bounds
 from fast_line_finder import find_contrast_line
+from frame_capture import Frame, FrameBuffers
+from frame_context import FrameContext
+from window_tracker import WindowBoundsTracker
+from window_discovery import MultiWindowScheduler
+from ocr_optimizer import load_ocr_profile, preprocess, tesseract_config
+from clickbot.click_executor import ClickExecutor
+from clickbot.poll_scheduler import AdaptivePollScheduler
 from datetime import datetime
 
+# Mouse actions run off the detection loop
+clicker = ClickExecutor()
+
+# OCR preprocessing and tesseract modes chosen by `ocr_optimizer.py --corpus`
+OCR_PROFILE = load_ocr_profile()
+
+# Save raw region crops for ocr_corpus.py; off by default, it writes files every poll
+COLLECT_CORPUS = "--collect-corpus" in sys.argv
+
+# Accept button centre X in the single-window monitor's captures
+ACCEPT_BUTTON_X = 1817
+
 def log(message):
     """Print timestamped log message"""
     timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-4]
     print(f"[{timestamp}] {message}")
 
-def click_accept_button(button_info):
-    """Click the Accept button and verify click permissions."""
+def click_accept_button(button_info, detected_at=None):
+    """Queue a click on the Accept button; returns False if one is already pending."""
     try:
         # Calculate target coordinates - center of the button
         target_x = button_info['x'] + button_info['width'] // 2
@@ -24,13 +43,11 @@ def click_accept_button(button_info):
         log(f"Attempting click at center: ({target_x}, {target_y})")
         log(f"Button info: {button_info}")
         
-        # Move to button position first
-        pyautogui.moveTo(target_x, target_y, duration=0.2)
-        time.sleep(0.1)  # Brief pause to ensure movement completed
-        
-        # Perform click
-        pyautogui.click(target_x, target_y)
-        log("Click performed successfully")
+        # Move, pause and click on the executor thread
+        if not clicker.click(target_x, target_y, detected_at=detected_at, restore=False):
+            log("Click already pending for this button")
+            return False
+        log("Click queued")
         return True
         
     except Exception as e:
@@ -56,8 +73,13 @@ def get_accept_match_score(text):
             
     return score
 
-def monitor_accept_button(img, window_bounds, special_line):
-    """Monitor area to right of special line for Accept button."""
+def monitor_accept_button(img, window_bounds, special_line, ctx=None, button_x=ACCEPT_BUTTON_X):
+    """Monitor area to right of special line for Accept button.
+    
+    With a FrameContext of `img` the white mask comes from its shared gray image.
+    `button_x` is where the button centre is expected in `img`; with None any
+    column of the scan area is accepted.
+    """
     # Calculate monitoring region - focus on right side where button should be
     x_start = max(0, window_bounds['width'] - 400)  # Last 400 pixels from right edge
     y_start = max(0, window_bounds['height'] // 2)  # Start from middle of window
@@ -68,8 +90,8 @@ def monitor_accept_button(img, window_bounds, special_line):
         log("Invalid monitoring region dimensions")
         return []
         
-    # Target area for button (around 1817 x coordinate)
-    target_x = 1817 - x_start  # Convert to relative coordinates
+    # Target area for button (around button_x)
+    target_x = None if button_x is None else button_x - x_start  # Convert to relative coordinates
     log(f"Target X coordinate (relative): {target_x}")
     
     # Expected button characteristics
@@ -111,11 +133,12 @@ def monitor_accept_button(img, window_bounds, special_line):
     cv2.imwrite(debug_filename, cv2.cvtColor(scan_area_debug, cv2.COLOR_RGB2BGR))
     log(f"Saved scan area debug image: {debug_filename}")
     
-    # Convert to grayscale
-    gray_region = cv2.cvtColor(monitor_region, cv2.COLOR_RGB2GRAY)
-    
     # Find all white regions (threshold > 200)
-    _, white_mask = cv2.threshold(gray_region, 200, 255, cv2.THRESH_BINARY)
+    if ctx is not None:
+        white_mask = ctx.threshold(200, roi=(x_start, y_start, width, height))
+    else:
+        gray_region = cv2.cvtColor(monitor_region, cv2.COLOR_RGB2GRAY)
+        _, white_mask = cv2.threshold(gray_region, 200, 255, cv2.THRESH_BINARY)
     
     # Find connected components of white pixels
     num_labels, labels, stats, centroids = cv2.connectedComponentsWithStats(white_mask, connectivity=8)
@@ -168,7 +191,7 @@ def monitor_accept_button(img, window_bounds, special_line):
         if group:
             # Only add groups that are close to target X coordinate
             group_center_x = sum(r[0] + r[2]/2 for r in group) / len(group)
-            if abs(group_center_x - target_x) < 100:  # Increased range to 100 pixels
+            if target_x is None or abs(group_center_x - target_x) < 100:  # Increased range to 100 pixels
                 merged_groups.append(group)
                 log(f"Added group centered at X={x_start + group_center_x}")
     
@@ -192,29 +215,19 @@ def monitor_accept_button(img, window_bounds, special_line):
         # Extract and process this region for OCR
         region_slice = monitor_region[min_y:max_y, min_x:max_x]
         
-        # Scale up for OCR
-        scale_factor = 16
-        scaled = cv2.resize(region_slice, None, fx=scale_factor, fy=scale_factor, interpolation=cv2.INTER_CUBIC)
-        
-        # Convert to grayscale if needed
-        if len(scaled.shape) == 3:
-            scaled = cv2.cvtColor(scaled, cv2.COLOR_BGR2GRAY)
+        # Keep the unprocessed crop for the OCR corpus (see ocr_corpus.py)
+        if COLLECT_CORPUS:
+            cv2.imwrite(f'corpus_region_{timestamp}_{group_idx+1}.png', region_slice)
         
-        # Add padding
-        pad_x = 20 * scale_factor
-        pad_y = 10 * scale_factor
-        padded = cv2.copyMakeBorder(scaled, pad_y, pad_y, pad_x, pad_x, cv2.BORDER_CONSTANT, value=255)
-        
-        # Simple threshold
-        _, binary = cv2.threshold(padded, 200, 255, cv2.THRESH_BINARY)
+        # Scale up, pad and binarize as the OCR profile says
+        binary = preprocess(region_slice, OCR_PROFILE)
         
         # Save debug image of processed region
         debug_region_file = f'debug_merged_region_{timestamp}_{group_idx+1}.png'
         cv2.imwrite(debug_region_file, binary)
         
         # Run OCR with optimized settings
-        custom_config = r'--psm 8 --oem 1'
-        text = pytesseract.image_to_string(binary, config=custom_config).strip()
+        text = pytesseract.image_to_string(binary, config=tesseract_config(OCR_PROFILE)).strip()
         
         # Calculate match score
         score = 0
@@ -273,12 +286,57 @@ def monitor_accept_button(img, window_bounds, special_line):
     # Return the best matching region if any found
     if regions:
         # Sort by match score first, then by proximity to target X coordinate
-        regions.sort(key=lambda r: (-r['match_score'], abs((r['x'] + r['width']/2) - 1817)))
+        regions.sort(key=lambda r: (-r['match_score'],
+                                    0 if button_x is None else abs((r['x'] + r['width']/2) - button_x)))
         return [regions[0]]
     
     return []
 
-if __name__ == "__main__":
+def detect_accept_in_window(window, ctx, state):
+    """Accept detection for one window found by window_discovery.
+    
+    `state` caches the window's contrast line and, once a button has been
+    found, its distance from the right edge so later scans look there.
+    """
+    img = ctx.image
+    window_bounds = {'x': 0, 'y': 0, 'width': ctx.width, 'height': ctx.height}
+    offset = state.get('button_offset')
+    button_x = None if offset is None else ctx.width - offset
+    
+    special_line = state.get('line') or find_contrast_line(img, window_bounds, gray=ctx.gray())
+    if not special_line:
+        return False
+    state['line'] = special_line
+    
+    accept_regions = monitor_accept_button(img, window_bounds, special_line, ctx=ctx, button_x=button_x)
+    if accept_regions:
+        button = dict(accept_regions[0])
+        state['button_offset'] = ctx.width - (button['x'] + button['width'] / 2)
+        # Capture pixels -> screen coordinates (captures can be denser than points)
+        sx, sy = window.width / ctx.width, window.height / ctx.height
+        button.update(x=window.left + int(button['x'] * sx), y=window.top + int(button['y'] * sy),
+                      width=int(button['width'] * sx), height=int(button['height'] * sy))
+        log(f"Accept button in {window.id}")
+        click_accept_button(button, detected_at=time.time())
+    return bool(accept_regions)
+
+def watch_all_windows():
+    """Watch every Cursor window on every monitor, each at its own polling rate."""
+    log("Watching all Cursor windows (Press Ctrl+C to stop)")
+    scheduler = MultiWindowScheduler(detect_accept_in_window, floor_interval=0.01, ceiling_interval=1.0)
+    try:
+        scheduler.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        log(f"Window polling: {scheduler.stats()}")
+        log(f"Click latency: {clicker.latency_summary()}")
+        clicker.stop()
+        log("Monitor stopped.")
+
+if __name__ == "__main__" and "--all-windows" in sys.argv:
+    watch_all_windows()
+elif __name__ == "__main__":
     log("Starting Accept button monitor (Press Ctrl+C to stop)")
     
     # Initialize monitor selection
@@ -306,30 +364,36 @@ if __name__ == "__main__":
         error_count = 0  # Track consecutive errors
         MAX_ERRORS = 5   # Maximum consecutive errors before exit
         
+        # 10ms polls while the screen is active, backing off to 1s when static
+        scheduler = AdaptivePollScheduler(floor_interval=0.01, ceiling_interval=1.0)
+        
+        # Conversion buffers reused by every captured frame
+        frame_buffers = FrameBuffers()
+        
+        # Window bounds are re-detected only when the window moves; the contrast
+        # line is found relative to them, so drop it whenever they change
+        window_tracker = WindowBoundsTracker(strategy="projection", level=1)
+        line_cache = {}
+        window_tracker.add_listener(lambda old, new: line_cache.clear())
+        
         while True:
             try:
                 scan_count += 1
                 if time.time() - last_status >= 5:
-                    log(f"Still monitoring... ({scan_count} scans in last 5s)")
+                    log(f"Still monitoring... ({scan_count} scans in last 5s, polling at {scheduler.rate:.1f}Hz)")
                     scan_count = 0
                     last_status = time.time()
                     error_count = 0  # Reset error count on successful status update
                 
-                # Find window bounds
-                window_bounds = find_window_bounds()
-                if not window_bounds or not isinstance(window_bounds, dict) or 'width' not in window_bounds or 'height' not in window_bounds:
-                    time.sleep(0.05)
-                    continue
-                
-                # Take screenshot and find special line
+                # Take one screenshot shared by every detection stage
                 with mss.mss() as sct:
                     if target_monitor >= len(sct.monitors):
                         log(f"Error: Monitor {target_monitor} no longer available!")
                         break
                         
                     monitor = sct.monitors[target_monitor]
-                    screenshot = sct.grab(monitor)
-                    img = np.array(screenshot)
+                    frame = Frame(sct.grab(monitor), frame_buffers)
+                    img = frame.bgra  # Read-only view of the capture, no copy
                     
                     # Verify image dimensions
                     if len(img.shape) < 2 or img.shape[0] == 0 or img.shape[1] == 0:
@@ -337,20 +401,31 @@ if __name__ == "__main__":
                         time.sleep(0.05)
                         continue
                     
-                    special_line = find_contrast_line(img, window_bounds)
-                    if not special_line:
+                    # Derived images (gray, edges, masks) are computed once per frame
+                    ctx = FrameContext(frame)
+                    
+                    # Find window bounds
+                    window_bounds = window_tracker.update(ctx)
+                    if not window_bounds or not isinstance(window_bounds, dict) or 'width' not in window_bounds or 'height' not in window_bounds:
                         time.sleep(0.05)
                         continue
                     
+                    special_line = line_cache.get('line') or find_contrast_line(img, window_bounds, gray=ctx.gray())
+                    if special_line:
+                        line_cache['line'] = special_line
+                    if not special_line:
+                        scheduler.observe(img)
+                        scheduler.sleep()
+                        continue
+                    
                     # Monitor for Accept button
-                    accept_regions = monitor_accept_button(img, window_bounds, special_line)
+                    accept_regions = monitor_accept_button(img, window_bounds, special_line, ctx=ctx)
+                    scheduler.observe(img, accept_seen=bool(accept_regions))
                     
                     if accept_regions:
                         # Click the first Accept button found
-                        click_accept_button(accept_regions[0])
-                        time.sleep(0.1)
-                    else:
-                        time.sleep(0.01)
+                        click_accept_button(accept_regions[0], detected_at=time.time())
+                    scheduler.sleep()
                     
             except KeyboardInterrupt:
                 log("Received interrupt signal, stopping monitor...")
@@ -368,4 +443,6 @@ if __name__ == "__main__":
     except Exception as e:
         log(f"Fatal error: {str(e)}")
     finally:
+        log(f"Click latency: {clicker.latency_summary()}")
+        clicker.stop()
         log("Monitor stopped.") 
\ No newline at end of file
@@ -0,0 +1,95 @@
+"""
+Decide which text polarity is worth reading in a watched region.
+
+Text detectors mask and OCR both light-on-dark and dark-on-light text, but a
+window's theme rarely changes. The probe classifies a region from a strided
+sample of its pixels, the same dark-pixel ratio CursorFinder uses to find the
+Cursor monitor. It caches the answer per region key and re-samples once
+`revalidate_interval` seconds have passed. A dark theme only needs the light
+mask and a light theme only needs the dark one. A region that is neither
+clearly dark nor clearly light keeps both.
+"""
+import logging
+import time
+from typing import Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+DARK_THEME = "dark"
+LIGHT_THEME = "light"
+MIXED_THEME = "mixed"
+
+# Text polarities, named after the text colour as in PolarityMasks.light()/.dark()
+LIGHT_TEXT = "light"
+DARK_TEXT = "dark"
+
+# Sample every Nth pixel in each direction (1/64 of the pixels)
+SAMPLE_STRIDE = 8
+
+def _extreme_channels(img: np.ndarray, stride: int) -> Tuple[np.ndarray, np.ndarray]:
+    sample = img[::stride, ::stride]
+    # Pairwise min/max beats min/max(axis=2) on strided views
+    darkest = np.minimum(np.minimum(sample[:, :, 0], sample[:, :, 1]), sample[:, :, 2])
+    brightest = np.maximum(np.maximum(sample[:, :, 0], sample[:, :, 1]), sample[:, :, 2])
+    return darkest, brightest
+
+def dark_pixel_ratio(img: np.ndarray, dark_level: int, stride: int = SAMPLE_STRIDE) -> float:
+    """Fraction of sampled pixels whose brightest channel is <= dark_level."""
+    sample = img[::stride, ::stride]
+    brightest = np.maximum(np.maximum(sample[:, :, 0], sample[:, :, 1]), sample[:, :, 2])
+    return float(np.count_nonzero(brightest <= dark_level)) / brightest.size
+
+class ThemeProbe:
+    """Per-region theme cache with periodic re-validation."""
+
+    def __init__(self, dark_level: int = 60, light_level: int = 200, min_ratio: float = 0.5,
+                 revalidate_interval: float = 30.0, stride: int = SAMPLE_STRIDE,
+                 clock: Callable[[], float] = time.monotonic):
+        self.dark_level = dark_level      # Background at or below this is dark theme (Cursor panels are ~35-45)
+        self.light_level = light_level    # Background at or above this is light theme
+        self.min_ratio = min_ratio        # Share of sampled pixels needed to call a theme
+        self.revalidate_interval = revalidate_interval
+        self.stride = stride
+        self.clock = clock
+        self._themes: Dict[Hashable, Tuple[str, float]] = {}
+        self.samples = 0
+
+    def classify(self, img: np.ndarray) -> str:
+        """Theme of an RGB/BGR(A) image from its strided sample, uncached."""
+        self.samples += 1
+        darkest, brightest = _extreme_channels(img, self.stride)
+        if darkest.size == 0:
+            return MIXED_THEME
+        if np.count_nonzero(brightest <= self.dark_level) >= self.min_ratio * brightest.size:
+            return DARK_THEME
+        if np.count_nonzero(darkest >= self.light_level) >= self.min_ratio * darkest.size:
+            return LIGHT_THEME
+        return MIXED_THEME
+
+    def theme(self, key: Hashable, img: np.ndarray) -> str:
+        """Cached theme of the region `key`, re-sampled from `img` when stale."""
+        now = self.clock()
+        cached = self._themes.get(key)
+        if cached is not None and now - cached[1] < self.revalidate_interval:
+            return cached[0]
+        theme = self.classify(img)
+        if cached is None or cached[0] != theme:
+            logging.info(f"Region {key} theme: {theme}")
+        self._themes[key] = (theme, now)
+        return theme
+
+    def text_polarities(self, key: Hashable, img: np.ndarray) -> Tuple[str, ...]:
+        """Text polarities worth processing in the region: LIGHT_TEXT, DARK_TEXT or both."""
+        theme = self.theme(key, img)
+        if theme == DARK_THEME:
+            return (LIGHT_TEXT,)
+        if theme == LIGHT_THEME:
+            return (DARK_TEXT,)
+        return (LIGHT_TEXT, DARK_TEXT)
+
+    def invalidate(self, key: Optional[Hashable] = None):
+        """Forget one region's theme (or all of them) so the next call re-samples."""
+        if key is None:
+            self._themes.clear()
+        else:
+            self._themes.pop(key, None)
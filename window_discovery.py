@@ -0,0 +1,234 @@
+"""
+Find every Cursor window on every monitor and watch each one separately.
+
+Discovery captures all monitors in parallel, one worker thread (and mss handle)
+per monitor, and looks for large dark-theme regions in a 1/4-scale gray image.
+Each candidate gets a confidence and an ID that stays the same across
+discoveries while the window stays roughly in place.
+
+MultiWindowScheduler then runs a detection pipeline per window, each with its
+own AdaptivePollScheduler, so an idle window backs off without slowing the
+one that is active.
+"""
+import itertools
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import cv2
+import mss
+import numpy as np
+
+from clickbot.poll_scheduler import AdaptivePollScheduler
+from frame_capture import Frame, FrameBuffers
+from frame_context import FrameContext
+
+# Gray level at or below which a pixel counts as dark-theme background (Cursor panels are ~35-45)
+DARK_LEVEL = 50
+
+@dataclass
+class CandidateWindow:
+    """A dark-theme window found on one monitor, in absolute screen coordinates."""
+    id: str
+    monitor: int                  # Index into sct.monitors
+    left: int
+    top: int
+    width: int
+    height: int
+    confidence: float             # Fraction of the rectangle that is dark background
+
+    @property
+    def region(self) -> Dict[str, int]:
+        return {'left': self.left, 'top': self.top, 'width': self.width, 'height': self.height}
+
+    def iou(self, other: "CandidateWindow") -> float:
+        x0, y0 = max(self.left, other.left), max(self.top, other.top)
+        x1 = min(self.left + self.width, other.left + other.width)
+        y1 = min(self.top + self.height, other.top + other.height)
+        overlap = max(0, x1 - x0) * max(0, y1 - y0)
+        union = self.width * self.height + other.width * other.height - overlap
+        return overlap / union if union else 0.0
+
+class WindowDiscovery:
+    """Scan all monitors in parallel for dark-theme windows with stable IDs."""
+
+    def __init__(self, level: int = 2, min_size: Tuple[int, int] = (400, 300), min_confidence: float = 0.6,
+                 close_size: int = 15, match_iou: float = 0.5):
+        self.level = level                    # Pyramid level scanned (2 = 1/4 scale)
+        self.min_size = min_size              # Smallest window (width, height) in capture pixels
+        self.min_confidence = min_confidence
+        self.close_size = close_size          # Closing kernel (reduced pixels) that bridges text inside a window
+        self.match_iou = match_iou            # Overlap needed to keep a previous window's ID
+        self.windows: List[CandidateWindow] = []
+        self._ids = itertools.count(1)
+
+    def _scan_monitor(self, monitor: Dict) -> List[Tuple[int, int, int, int, float]]:
+        """Capture one monitor and find its dark regions; runs on a worker thread."""
+        # mss handles are not shareable across threads
+        with mss.mss() as sct:
+            return self.find_regions(FrameContext(Frame(sct.grab(monitor))), monitor)
+
+    def find_regions(self, ctx: FrameContext, monitor: Dict) -> List[Tuple[int, int, int, int, float]]:
+        """Dark regions in a monitor capture as absolute (left, top, width, height, confidence)."""
+        small = ctx.pyramid(self.level)
+        scale_x = monitor['width'] / ctx.width      # Capture pixels may be denser than screen points
+        scale_y = monitor['height'] / ctx.height
+        factor = 2 ** self.level
+
+        dark = (small <= DARK_LEVEL).astype(np.uint8)
+        kernel = np.ones((self.close_size, self.close_size), np.uint8)
+        closed = cv2.morphologyEx(dark, cv2.MORPH_CLOSE, kernel)
+        count, labels, stats, _ = cv2.connectedComponentsWithStats(closed, connectivity=4)
+
+        regions = []
+        for label in range(1, count):
+            x, y, w, h, _ = stats[label]
+            if w * factor < self.min_size[0] or h * factor < self.min_size[1]:
+                continue
+            confidence = float(dark[y:y + h, x:x + w].mean())
+            if confidence < self.min_confidence:
+                continue
+            regions.append((
+                monitor['left'] + int(x * factor * scale_x),
+                monitor['top'] + int(y * factor * scale_y),
+                int(w * factor * scale_x),
+                int(h * factor * scale_y),
+                confidence,
+            ))
+        return regions
+
+    def discover(self) -> List[CandidateWindow]:
+        """Rescan every monitor; windows that overlap a previous one keep its ID."""
+        with mss.mss() as sct:
+            monitors = [dict(m) for m in sct.monitors[1:]]
+        if not monitors:
+            return []
+
+        found: List[CandidateWindow] = []
+        with ThreadPoolExecutor(max_workers=len(monitors)) as pool:
+            futures = [pool.submit(self._scan_monitor, m) for m in monitors]
+            for i, future in enumerate(futures, 1):
+                try:
+                    regions = future.result()
+                except Exception as e:
+                    logging.warning(f"Error scanning monitor {i}: {str(e)}")
+                    continue
+                for left, top, width, height, confidence in regions:
+                    found.append(CandidateWindow("", i, left, top, width, height, confidence))
+
+        previous = list(self.windows)
+        for window in sorted(found, key=lambda w: -w.confidence):
+            best = max(previous, key=window.iou, default=None)
+            if best is not None and window.iou(best) >= self.match_iou:
+                window.id = best.id
+                previous.remove(best)
+            else:
+                window.id = f"window-{next(self._ids)}"
+                logging.info(f"New window {window.id} on monitor {window.monitor}: "
+                             f"{window.width}x{window.height} at ({window.left}, {window.top}), "
+                             f"confidence {window.confidence:.2f}")
+        for window in previous:
+            logging.info(f"Window {window.id} is gone")
+        self.windows = found
+        return found
+
+# Called as pipeline(window, ctx, state) -> True when an Accept button was seen.
+# `state` is a dict kept per window for the pipeline's own caches.
+WindowPipeline = Callable[[CandidateWindow, FrameContext, Dict[str, Any]], bool]
+
+@dataclass
+class _WatchedWindow:
+    window: CandidateWindow
+    poll: AdaptivePollScheduler
+    next_due: float = 0.0
+    state: Dict[str, Any] = field(default_factory=dict)
+    buffers: FrameBuffers = field(default_factory=FrameBuffers)
+
+class MultiWindowScheduler:
+    """Run a detection pipeline for every discovered window at its own polling rate."""
+
+    def __init__(self, pipeline: WindowPipeline, discovery: Optional[WindowDiscovery] = None,
+                 rediscover_interval: float = 10.0, floor_interval: float = 0.05, ceiling_interval: float = 1.0,
+                 max_workers: int = 4):
+        self.pipeline = pipeline
+        self.discovery = discovery or WindowDiscovery()
+        self.rediscover_interval = rediscover_interval
+        self.floor_interval = floor_interval
+        self.ceiling_interval = ceiling_interval
+        self.max_workers = max_workers
+        self.watched: Dict[str, _WatchedWindow] = {}
+        self.last_discovery = 0.0
+        # One mss handle per worker thread, opened on its first capture and kept
+        self._local = threading.local()
+        self._handles = []
+        self._handles_lock = threading.Lock()
+
+    def rediscover(self):
+        windows = self.discovery.discover()
+        self.last_discovery = time.monotonic()
+        current = {}
+        for window in windows:
+            watched = self.watched.get(window.id)
+            if watched is None:
+                watched = _WatchedWindow(window, AdaptivePollScheduler(self.floor_interval, self.ceiling_interval))
+            elif watched.window.region != window.region:
+                watched.state.clear()  # Pipeline caches are relative to the old rectangle
+            watched.window = window
+            current[window.id] = watched
+        self.watched = current
+
+    def _thread_sct(self):
+        """This worker thread's mss handle; handles are not shareable across threads."""
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = self._local.sct = mss.mss()
+            with self._handles_lock:
+                self._handles.append(sct)
+        return sct
+
+    def _close_handles(self):
+        with self._handles_lock:
+            for sct in self._handles:
+                sct.close()
+            self._handles.clear()
+
+    def _run_window(self, watched: _WatchedWindow) -> bool:
+        """Capture one window and run the pipeline on it; runs on a worker thread."""
+        frame = Frame(self._thread_sct().grab(watched.window.region), watched.buffers)
+        accept_seen = bool(self.pipeline(watched.window, FrameContext(frame), watched.state))
+        watched.poll.observe(frame.bgra, accept_seen=accept_seen)
+        return accept_seen
+
+    def run_once(self, pool: ThreadPoolExecutor) -> float:
+        """Run every window that is due; returns seconds until the next one is."""
+        now = time.monotonic()
+        if not self.watched or now - self.last_discovery >= self.rediscover_interval:
+            self.rediscover()
+
+        due = [w for w in self.watched.values() if w.next_due <= now]
+        futures = {pool.submit(self._run_window, w): w for w in due}
+        for future, watched in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                logging.error(f"Error watching {watched.window.id}: {str(e)}")
+            watched.next_due = time.monotonic() + watched.poll.interval
+
+        if not self.watched:
+            return self.ceiling_interval
+        return max(0.0, min(w.next_due for w in self.watched.values()) - time.monotonic())
+
+    def run(self):
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                while True:
+                    time.sleep(self.run_once(pool))
+        finally:
+            # The workers have exited, so their handles are no longer in use
+            self._close_handles()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {window_id: watched.poll.stats() for window_id, watched in self.watched.items()}
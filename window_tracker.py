@@ -0,0 +1,98 @@
+"""
+Keep window bounds across frames instead of re-detecting them every tick.
+
+The window only moves when the user drags or resizes it. After a full
+detection the tracker samples edge strength across each of the four border
+lines; on later frames it re-samples the same points and runs full detection
+again only when that fingerprint diverges. Listeners are told when the bounds
+change so caches derived from them can be dropped.
+"""
+import logging
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from fast_window_finder import find_window_bounds
+from frame_context import FrameContext
+
+# Called as listener(old_bounds, new_bounds); either may be None
+BoundsListener = Callable[[Optional[Dict], Optional[Dict]], None]
+
+class WindowBoundsTracker:
+    """Cache window bounds and verify them per frame from border edge samples."""
+
+    def __init__(self, strategy: str = "projection", samples: int = 64, band: int = 2,
+                 tolerance: float = 0.35, **options):
+        # Projection (level 1 by default) is both fast and accurate on field
+        # captures; see benchmark_window_bounds.py
+        self.strategy = strategy
+        self.options = options
+        self.samples = samples        # Points sampled along each border line
+        self.band = band              # Rows/columns either side of a line to look for its edge
+        self.tolerance = tolerance    # Max mean strength change, relative to the detected strength
+        self.bounds: Optional[Dict] = None
+        self.generation = 0           # Bumped on every change; usable as a cache key
+        self._fingerprint: Optional[np.ndarray] = None
+        self._listeners: List[BoundsListener] = []
+        self.detections = 0
+        self.verifications = 0
+
+    def add_listener(self, listener: BoundsListener):
+        self._listeners.append(listener)
+
+    def _border_strength(self, ctx: FrameContext, bounds: Dict) -> Optional[np.ndarray]:
+        """Edge strength across each border at evenly spaced points, shape (4, samples)."""
+        gray = ctx.gray()
+        height, width = gray.shape
+        left, top = bounds['x'], bounds['y']
+        if left < 0 or top < 0 or left >= width or top >= height:
+            return None
+        # A maximized window's far borders sit on (or past) the frame's last row/column
+        right = min(left + bounds['width'], width - 1)
+        bottom = min(top + bounds['height'], height - 1)
+
+        xs = np.linspace(left, right, self.samples).astype(int)
+        ys = np.linspace(top, bottom, self.samples).astype(int)
+        strengths = []
+        for y in (top, bottom):
+            rows = gray[max(0, y - self.band - 1):min(height, y + self.band + 2), xs].astype(np.int16)
+            strengths.append(np.abs(np.diff(rows, axis=0)).max(axis=0))
+        for x in (left, right):
+            cols = gray[ys, max(0, x - self.band - 1):min(width, x + self.band + 2)].astype(np.int16)
+            strengths.append(np.abs(np.diff(cols, axis=1)).max(axis=1))
+        return np.stack(strengths).astype(np.float32)
+
+    def verify(self, ctx: FrameContext) -> bool:
+        """Check that the cached borders still have the edges seen at detection."""
+        if self.bounds is None or self._fingerprint is None:
+            return False
+        self.verifications += 1
+        strength = self._border_strength(ctx, self.bounds)
+        if strength is None or strength.shape != self._fingerprint.shape:
+            return False
+        change = np.abs(strength - self._fingerprint).mean(axis=1)
+        scale = np.maximum(self._fingerprint.mean(axis=1), 1.0)
+        return bool(np.all(change / scale <= self.tolerance))
+
+    def update(self, ctx: FrameContext) -> Optional[Dict]:
+        """Bounds for this frame, running full detection only if verification fails."""
+        if self.verify(ctx):
+            return self.bounds
+
+        self.detections += 1
+        bounds = find_window_bounds(ctx, self.strategy, **self.options)
+        self._fingerprint = None if bounds is None else self._border_strength(ctx, bounds)
+        if bounds != self.bounds:
+            old, self.bounds = self.bounds, bounds
+            self.generation += 1
+            logging.debug(f"Window bounds changed: {old} -> {bounds}")
+            for listener in self._listeners:
+                listener(old, bounds)
+        return self.bounds
+
+    def invalidate(self):
+        """Force full detection on the next update."""
+        self._fingerprint = None
+
+    def stats(self) -> Dict[str, int]:
+        return {"detections": self.detections, "verifications": self.verifications, "generation": self.generation}